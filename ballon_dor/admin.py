@@ -1,5 +1,36 @@
 from django.contrib import admin
-from .models import Player, Vote, BallonDorResult, Club, NationalTeam, Candidate
+from .models import (
+    Player,
+    Vote,
+    BallonDorResult,
+    Club,
+    NationalTeam,
+    Candidate,
+    OutboxEmail,
+    FinalResult,
+    Election,
+)
+from .pagination import EstimatedCountPaginator
+
+
+class YearFilter(admin.SimpleListFilter):
+    """Election years, taken from the small candidate table, not DISTINCT on votes."""
+
+    title = "year"
+    parameter_name = "year"
+
+    def lookups(self, request, model_admin):
+        years = (
+            Candidate.objects.order_by("-year")
+            .values_list("year", flat=True)
+            .distinct()
+        )
+        return [(year, year) for year in years]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(year=self.value())
+        return queryset
 
 
 @admin.register(Player)
@@ -10,8 +41,22 @@ class PlayerAdmin(admin.ModelAdmin):
 
 @admin.register(Vote)
 class VoteAdmin(admin.ModelAdmin):
-    list_display = ("voter_name", "voter_country", "created_at", "ip_address")
-    list_filter = ("voter_country", "created_at")
+    list_display = (
+        "email",
+        "year",
+        "player_1st",
+        "player_2nd",
+        "player_3rd",
+        "is_verified",
+        "voter_country",
+        "created_at",
+    )
+    # year/is_verified match the partial vote indexes; no full-table DISTINCTs
+    list_filter = (YearFilter, "is_verified")
+    list_select_related = ("player_1st", "player_2nd", "player_3rd")
+    raw_id_fields = ("player_1st", "player_2nd", "player_3rd")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(BallonDorResult)
@@ -53,8 +98,12 @@ class CandidateAdmin(admin.ModelAdmin):
         "appearances",
         "avg_match_rating",
     )
-    list_filter = ("year", "club")
+    list_filter = (YearFilter, "club")
     search_fields = ("player__name", "slug")
+    list_select_related = ("player", "club")
+    raw_id_fields = ("player",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     prepopulated_fields = {"slug": ("player",)}
 
     fieldsets = (
@@ -87,3 +136,32 @@ class CandidateAdmin(admin.ModelAdmin):
     def get_readonly_fields(self, request, obj=None):
         # You could add calculated fields here if needed
         return self.readonly_fields
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("to", "subject", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("to",)
+    readonly_fields = ("created_at", "sent_at", "last_error")
+
+
+@admin.register(Election)
+class ElectionAdmin(admin.ModelAdmin):
+    list_display = (
+        "year",
+        "opens_at",
+        "closes_at",
+        "points_1st",
+        "points_2nd",
+        "points_3rd",
+        "is_finalized",
+    )
+    ordering = ("-year",)
+
+
+@admin.register(FinalResult)
+class FinalResultAdmin(admin.ModelAdmin):
+    list_display = ("year", "winner", "points", "total_votes", "finalized_at")
+    list_select_related = ("winner__player",)
+    readonly_fields = ("finalized_at",)
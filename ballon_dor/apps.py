@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class BallonDorConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ballon_dor"
+
+    def ready(self):
+        import cloudinary
+        from django.conf import settings
+
+        from . import signals  # noqa: F401
+
+        cloudinary.config(
+            cloud_name=settings.CLOUDINARY_STORAGE["CLOUD_NAME"],
+            api_key=settings.CLOUDINARY_STORAGE["API_KEY"],
+            api_secret=settings.CLOUDINARY_STORAGE["API_SECRET"],
+            secure=True,  # Use HTTPS URLs
+        )
@@ -0,0 +1,158 @@
+"""
+Versioned cache for vote results.
+
+Results are cached under ``(year, results version)``. ``VerifyView`` bumps
+the version whenever a vote is verified, so a new vote shows up on the next
+request while an unchanged tally keeps being served from the cache.
+
+Recomputation is single-flight: when the current key is missing, the worker
+that wins a short ``cache.add`` lock recomputes, and the others keep serving
+the last value they can find (the stale copy) instead of piling onto the
+database at the same time.
+
+In a replica view (see ``routers``) results are computed from the replica.
+The replica may not have the newest vote yet, so such a value is only kept
+for ``REPLICA_PIN_SECONDS`` and is marked as read from the replica: other
+replica readers reuse it, while primary readers (a voter pinned after
+verifying) recompute. Catalog values change rarely and are always read from
+the primary.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .routers import primary_reads, replica_reads_enabled
+
+RESULTS_TIMEOUT = 5 * 60
+STALE_TIMEOUT = 60 * 60
+LOCK_TIMEOUT = 10
+
+_MISSING = object()
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old value
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def _results_version_key(year):
+    return f"ballon_dor:results:{year}:version"
+
+
+def get_results_version(year):
+    """Return the current results version for ``year``."""
+    return _get_version(_results_version_key(year))
+
+
+def bump_results_version(year):
+    """Invalidate every cached result for ``year``."""
+    _bump_version(_results_version_key(year))
+
+
+CATALOG_VERSION_KEY = "ballon_dor:catalog:version"
+
+
+def get_catalog_version():
+    """Version of the candidate/player/club data, bumped by model signals."""
+    return _get_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    _bump_version(CATALOG_VERSION_KEY)
+
+
+# Per-process memos (election snapshot, search index) follow a version too,
+# but also reload after this many seconds: with a per-process cache (LocMem)
+# another worker's or a management command's bump is never seen.
+SNAPSHOT_TTL = 60
+
+ELECTION_VERSION_KEY = "ballon_dor:election:version"
+
+
+def get_election_version():
+    """Version of the active-year configuration, bumped when candidates change."""
+    return _get_version(ELECTION_VERSION_KEY)
+
+
+def bump_election_version():
+    _bump_version(ELECTION_VERSION_KEY)
+
+
+CATALOG_TIMEOUT = 60 * 60
+
+
+def cached_catalog(year, name, compute, timeout=CATALOG_TIMEOUT):
+    """
+    Return ``compute()`` for the current catalog version.
+
+    For values derived from candidates, players and clubs only (filter lists,
+    form choices); any catalog save moves every such value to a new key.
+    """
+    key = f"ballon_dor:{name}:{year}:catalog:{get_catalog_version()}"
+    return cache.get_or_set(key, lambda: _from_primary(compute), timeout=timeout)
+
+
+def page_etag(request, *parts):
+    """
+    Build an ETag from the request path and the versions a page depends on.
+
+    Computing it costs a few cache reads, so unchanged pages can be answered
+    with a 304 before any template is rendered.
+    """
+    raw = "|".join(str(part) for part in (request.get_full_path(), *parts))
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def _from_primary(compute):
+    with primary_reads():
+        return compute()
+
+
+def cached_result(year, name, compute, timeout=RESULTS_TIMEOUT):
+    """
+    Return ``compute()`` for the current results version of ``year``.
+
+    ``name`` identifies the value (e.g. ``"live_results"``); ``compute`` is
+    only called by the worker holding the recompute lock, or when no earlier
+    value exists at all.
+    """
+    key = f"ballon_dor:{name}:{year}:{get_results_version(year)}"
+    on_replica = replica_reads_enabled()
+    entry = cache.get(key, _MISSING)
+    if entry is not _MISSING:
+        value, from_replica = entry
+        if on_replica or not from_replica:
+            return value
+
+    stale_key = f"ballon_dor:{name}:{year}:stale"
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, True, timeout=LOCK_TIMEOUT):
+        try:
+            value = compute()
+            if on_replica:
+                timeout = min(timeout, settings.REPLICA_PIN_SECONDS)
+            cache.set(key, (value, on_replica), timeout=timeout)
+            cache.set(stale_key, value, timeout=STALE_TIMEOUT)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    # Someone else is recomputing - serve the previous value if we have one
+    value = cache.get(stale_key, _MISSING)
+    if value is not _MISSING:
+        return value
+    return compute()
@@ -0,0 +1,11 @@
+from .utils import get_election, is_voting_closed
+
+
+def election(request):
+    """Active year, deadline and voting state for every template, from the snapshot."""
+    rules = get_election()
+    return {
+        "active_year": rules.year,
+        "deadline": rules.closes_at,
+        "voting_closed": is_voting_closed(rules.year),
+    }
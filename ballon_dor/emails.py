@@ -0,0 +1,133 @@
+"""
+Outgoing email.
+
+Requests only queue messages in the ``OutboxEmail`` table; the
+``send_outbox`` management command drains it in batches over a single SMTP
+connection, retrying failures with exponential backoff.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = timedelta(seconds=30)
+RETRY_MAX_DELAY = timedelta(hours=1)
+# Rows picked by a worker are hidden from other workers this long
+CLAIM_TIMEOUT = timedelta(minutes=5)
+
+
+def queue_verification_email(vote):
+    """Queue the "confirm your vote" email (call inside the vote's transaction)."""
+    active_year = vote.year
+    verify_url = f"https://fansaward.com{reverse('verify', args=[vote.token])}"
+
+    html_body = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif; background-color: #f4f4f4; padding: 20px;">
+            <div style="max-width: 600px; margin: auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 0 10px rgba(0,0,0,0.05);">
+            <h2 style="color: #333;">Confirm Your Vote</h2>
+            <p style="font-size: 16px; color: #444;">
+                Thank you for submitting your vote for the <strong>{active_year} vote</strong>.
+                To confirm your vote, please click the button below:
+            </p>
+            <div style="text-align: center; margin: 30px 0;">
+                <a href="{verify_url}" style="background-color: #1d4ed8; color: white; padding: 12px 24px; border-radius: 6px; text-decoration: none; font-weight: bold;">✅ Verify Your Vote</a>
+            </div>
+            <p style="font-size: 14px; color: #555;">
+                Or copy and paste this link into your browser:<br>
+                <a href="{verify_url}" style="color: #1d4ed8;">{verify_url}</a>
+            </p>
+            <hr style="border: none; border-top: 1px solid #eee; margin: 40px 0;">
+            <p style="font-size: 12px; color: #888;">
+                If you didn't request this, you can ignore this email.<br>
+                — FansAward Team
+            </p>
+            </div>
+        </body>
+        </html>
+    """
+
+    return OutboxEmail.objects.create(
+        to=vote.email, subject="Confirm Your Vote", html_body=html_body
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff: 30s, 1m, 2m, ... capped at an hour."""
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+
+def claim_batch(batch_size):
+    """Lock up to ``batch_size`` due emails for this worker and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEmail.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            next_attempt_at=now + CLAIM_TIMEOUT
+        )
+    return batch
+
+
+def send_batch(batch_size=50, max_attempts=MAX_ATTEMPTS):
+    """
+    Send one batch of due emails over a single SMTP connection.
+
+    Returns ``(sent, failed)`` counts. Failed emails are rescheduled with
+    backoff until they reach ``max_attempts``.
+    """
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        for email in batch:
+            message = EmailMessage(
+                email.subject,
+                email.html_body,
+                f"FansAward App <{settings.EMAIL_HOST_USER}>",
+                [email.to],
+                connection=connection,
+            )
+            message.content_subtype = "html"
+            try:
+                connection.send_messages([message])
+            except Exception as e:
+                # Start the next message on a fresh connection
+                connection.close()
+                email.attempts += 1
+                email.last_error = str(e)
+                if email.attempts >= max_attempts:
+                    email.status = OutboxEmail.FAILED
+                else:
+                    email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+                failed += 1
+            else:
+                email.attempts += 1
+                email.status = OutboxEmail.SENT
+                email.sent_at = timezone.now()
+                sent += 1
+            email.save(
+                update_fields=[
+                    "attempts",
+                    "status",
+                    "next_attempt_at",
+                    "last_error",
+                    "sent_at",
+                ]
+            )
+    finally:
+        connection.close()
+    return sent, failed
@@ -0,0 +1,46 @@
+from collections import Counter, namedtuple
+
+from django.db.models import Count
+
+from .caching import cached_catalog
+from .models import Candidate
+
+# ``pairs`` maps (club name, player country) to a candidate count; every
+# club/country filter combination can be counted from it without a query.
+Facets = namedtuple("Facets", ["pairs", "clubs", "countries"])
+
+
+def compute_facets(year):
+    rows = (
+        Candidate.objects.filter(year=year)
+        .values_list("club__name", "player__country")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    pairs = {(club, country): n for club, country, n in rows}
+
+    clubs = Counter()
+    countries = Counter()
+    for (club, country), n in pairs.items():
+        clubs[club] += n
+        countries[country] += n
+    return Facets(
+        pairs,
+        # Candidates without a club or country still count, but get no option
+        sorted((club, n) for club, n in clubs.items() if club),
+        sorted((country, n) for country, n in countries.items() if country),
+    )
+
+
+def get_facets(year):
+    """Club and country filter options with candidate counts, cached per catalog."""
+    return cached_catalog(year, "facets", lambda: compute_facets(year))
+
+
+def facet_count(facets, club="", country=""):
+    """Number of candidates matching the club and/or country filter."""
+    return sum(
+        n
+        for (pair_club, pair_country), n in facets.pairs.items()
+        if (not club or pair_club == club) and (not country or pair_country == country)
+    )
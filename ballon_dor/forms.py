@@ -1,11 +1,74 @@
 from django import forms
+from .caching import cached_catalog
 from .models import Player, Vote
 from .utils import get_active_year
 from django_countries.fields import CountryField
 
 
+def candidate_choices(year):
+    """The year's candidates as an immutable ((player id, name), ...), cached."""
+    return cached_catalog(
+        year,
+        "vote_choices",
+        lambda: tuple(
+            Player.objects.filter(candidate__year=year)
+            .order_by("name")
+            .values_list("id", "name")
+        ),
+    )
+
+
+class CandidateChoiceField(forms.ChoiceField):
+    """
+    A player select backed by ``candidate_choices`` instead of a queryset.
+
+    Submitted ids are checked against the cached choices, and the cleaned value
+    is an unsaved ``Player`` carrying the id and name, so neither rendering nor
+    validating the form queries the database.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.names = {}
+
+    def set_candidates(self, choices):
+        self.names = dict(choices)
+        self.choices = [("", ""), *choices]
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            player_id = int(value)
+        except (TypeError, ValueError):
+            player_id = None
+        if player_id not in self.names:
+            raise forms.ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+        return Player(pk=player_id, name=self.names[player_id])
+
+    def validate(self, value):
+        # to_python already checked the choice
+        forms.Field.validate(self, value)
+
+
 class VoteForm(forms.ModelForm):
     voter_country = CountryField(blank_label="").formfield(required=False)
+    player_1st = CandidateChoiceField(
+        label="1st Place",
+        error_messages={"required": "Please select your 1st place player."},
+    )
+    player_2nd = CandidateChoiceField(
+        label="2nd Place",
+        error_messages={"required": "Please select your 2nd place player."},
+    )
+    player_3rd = CandidateChoiceField(
+        label="3rd Place",
+        error_messages={"required": "Please select your 3rd place player."},
+    )
 
     class Meta:
         model = Vote
@@ -23,36 +86,22 @@ class VoteForm(forms.ModelForm):
         self.fields["email"].required = True
         if year is None:
             year = get_active_year()  # helper
-        allowed_qs = Player.objects.filter(candidate__year=year).order_by("name")
+        # One shared, cached choice list for all three selects
+        choices = candidate_choices(year)
         for field in ["player_1st", "player_2nd", "player_3rd"]:
-            self.fields[field].queryset = allowed_qs
-            self.fields[field].label = field.replace("_", " ").capitalize()
-
-        # to Update all the labels to be more user-friendly
-        self.fields["player_1st"].label = "1st Place"
-        self.fields["player_2nd"].label = "2nd Place"
-        self.fields["player_3rd"].label = "3rd Place"
+            self.fields[field].set_candidates(choices)
 
         # to add (optional) to the labels
         self.fields["voter_name"].label = "Your Name (optional)"
         self.fields["voter_country"].label = "Your Country (optional)"
         self.fields["email"].label = "Your Email"
 
-        # remove the empty choice (dotted lines):
-        self.fields["player_1st"].empty_label = ""
-        self.fields["player_2nd"].empty_label = ""
-        self.fields["player_3rd"].empty_label = ""
-
-        # CUSTOM ERROR MESSAGES:
-        self.fields["player_1st"].error_messages = {
-            "required": "Please select your 1st place player."
-        }
-        self.fields["player_2nd"].error_messages = {
-            "required": "Please select your 2nd place player."
-        }
-        self.fields["player_3rd"].error_messages = {
-            "required": "Please select your 3rd place player."
-        }
+    def _get_validation_exclusions(self):
+        # The picks were checked against the cached candidates; skip the
+        # model's per-ForeignKey existence queries
+        exclude = super()._get_validation_exclusions()
+        exclude.update(["player_1st", "player_2nd", "player_3rd"])
+        return exclude
 
     def clean(self):
         cleaned_data = super().clean()
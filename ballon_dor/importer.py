@@ -0,0 +1,144 @@
+from collections import defaultdict
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.text import slugify
+
+from .caching import bump_catalog_version, bump_election_version
+from .models import BallonDorResult, Candidate, Club, NationalTeam, Player
+from .utils import clear_election_config
+
+# Dependency order: every model only points at models listed before it
+IMPORT_ORDER = (Player, Club, NationalTeam, Candidate, BallonDorResult)
+BATCH_SIZE = 500
+
+
+class CatalogImportError(ValueError):
+    pass
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def parse_objects(records):
+    """
+    Turn dumpdata-style records into unsaved instances, grouped by model.
+
+    Records for other models (votes, users, sessions...) are counted and
+    skipped. A later record with the same pk replaces an earlier one, so
+    several files can be layered.
+    """
+    models = {_label(model): model for model in IMPORT_ORDER}
+    objects = defaultdict(dict)
+    skipped = 0
+    for record in records:
+        model = models.get(record["model"])
+        if model is None:
+            skipped += 1
+            continue
+        values = {model._meta.pk.attname: record["pk"]}
+        for name, value in record["fields"].items():
+            field = model._meta.get_field(name)
+            if field.is_relation:
+                values[field.attname] = value
+            else:
+                values[field.attname] = field.to_python(value)
+        objects[model][record["pk"]] = model(**values)
+    return objects, skipped
+
+
+def _check_references(objects):
+    """Every FK must point at a row in the file or already in the database."""
+    for model in IMPORT_ORDER:
+        for field in model._meta.concrete_fields:
+            if not field.is_relation:
+                continue
+            target = field.related_model
+            wanted = {
+                getattr(obj, field.attname) for obj in objects[model].values()
+            } - {None}
+            missing = wanted - set(objects[target])
+            if missing:
+                missing -= set(
+                    target.objects.filter(pk__in=missing).values_list("pk", flat=True)
+                )
+            if missing:
+                raise CatalogImportError(
+                    f"{_label(model)}.{field.name} points at missing "
+                    f"{_label(target)} ids: {sorted(missing)[:10]}"
+                )
+
+
+def _assign_slugs(objects):
+    """Give slug-less candidates a unique per-year slug, as Candidate.save would."""
+    candidates = objects[Candidate]
+    pending = [c for c in candidates.values() if not c.slug]
+    if not pending:
+        return
+
+    years = {c.year for c in candidates.values()}
+    taken = {
+        (year, slug): pk
+        for pk, year, slug in Candidate.objects.filter(year__in=years)
+        .exclude(slug="")
+        .values_list("pk", "year", "slug")
+        if pk not in candidates
+    }
+    taken.update({(c.year, c.slug): c.pk for c in candidates.values() if c.slug})
+
+    names = {pk: player.name for pk, player in objects[Player].items()}
+    unknown = {c.player_id for c in pending} - set(names)
+    names.update(Player.objects.filter(pk__in=unknown).values_list("pk", "name"))
+
+    for candidate in pending:
+        base_slug = slugify(names[candidate.player_id])
+        slug = base_slug
+        counter = 1
+        while (candidate.year, slug) in taken:
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        candidate.slug = slug
+        taken[(candidate.year, slug)] = candidate.pk
+
+
+def import_catalog(records):
+    """
+    Upsert players, clubs, national teams, candidates and results by pk.
+
+    Returns ({model label: rows written}, skipped records). Re-importing an
+    updated file updates the existing rows instead of duplicating them.
+    """
+    objects, skipped = parse_objects(records)
+    counts = {}
+    with transaction.atomic():
+        _check_references(objects)
+        _assign_slugs(objects)
+        for model in IMPORT_ORDER:
+            rows = list(objects[model].values())
+            if not rows:
+                continue
+            pk = model._meta.pk
+            model.objects.bulk_create(
+                rows,
+                batch_size=BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=[pk.name],
+                update_fields=[
+                    f.name for f in model._meta.concrete_fields if not f.primary_key
+                ],
+            )
+            counts[_label(model)] = len(rows)
+
+        # Explicit pks don't advance postgres sequences
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), IMPORT_ORDER)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+        # bulk_create sends no post_save, so invalidate what the signals would
+        clear_election_config()
+        transaction.on_commit(bump_catalog_version)
+        transaction.on_commit(bump_election_version)
+    return counts, skipped
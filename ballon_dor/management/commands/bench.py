@@ -0,0 +1,243 @@
+import json
+import platform
+import random
+import tracemalloc
+import uuid
+from time import perf_counter
+
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from ballon_dor.models import Candidate, Club, Player, Vote
+from ballon_dor.scoring import rebuild_scores
+
+COUNTRIES = [
+    "US", "GB", "FR", "ES", "BR", "AR", "DE", "IT", "PT", "NL",
+    "MA", "EG", "NG", "MX", "CO", "JP", "KR", "SA", "LY", "TR",
+    "BE", "HR", "PL", "SE", "NO", "DK", "CH", "AT", "IE", "CA",
+]  # fmt: skip
+
+
+def zipf_weights(n, s=1.1):
+    """Popularity weights: a few players/countries get most of the votes."""
+    return [1 / (rank**s) for rank in range(1, n + 1)]
+
+
+def percentiles(values):
+    values = sorted(values)
+    last = len(values) - 1
+    return {
+        name: round(values[round(fraction * last)], 2)
+        for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic election and time the public views through the "
+        "test client. Runs in a throwaway test database and prints JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=150)
+        parser.add_argument("--candidates", type=int, default=30)
+        parser.add_argument("--votes", type=int, default=10_000)
+        parser.add_argument(
+            "--unverified",
+            type=float,
+            default=0.2,
+            help="Unverified votes, as a fraction of --votes (at least one per "
+            "timed verify request).",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Timed requests per view."
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Also write the JSON report here.")
+        parser.add_argument(
+            "--use-current-db",
+            action="store_true",
+            help="Write into the configured database instead of a test database "
+            "(used by the test suite, which already runs in one).",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        if options["use_current_db"]:
+            report = self.run(options)
+        else:
+            setup_test_environment()
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            try:
+                report = self.run(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output)
+        self.stdout.write(output)
+
+    def run(self, options):
+        # Measure the views themselves, not the throttle in front of them
+        with override_settings(RATE_LIMIT_ENABLED=False):
+            return self.run_scenarios(options)
+
+    def run_scenarios(self, options):
+        year = timezone.now().year + 1  # keeps voting open
+        start = perf_counter()
+        candidates, pending_tokens = self.generate(year, options)
+        generate_seconds = perf_counter() - start
+        cache.clear()
+
+        client = Client()
+        requests = options["requests"]
+        candidate_urls = [
+            reverse("candidate_detail", args=[year, c.slug]) for c in candidates
+        ]
+        player_ids = [c.player_id for c in candidates]
+        new_votes = iter(range(10**9))
+
+        def post_vote():
+            first, second, third = self.random.sample(player_ids, 3)
+            return client.post(
+                reverse("vote"),
+                {
+                    "player_1st": first,
+                    "player_2nd": second,
+                    "player_3rd": third,
+                    "email": f"bench{next(new_votes)}@example.com",
+                    "voter_country": self.random.choice(COUNTRIES),
+                },
+            )
+
+        scenarios = {
+            "home": lambda: client.get(reverse("home")),
+            "live_results": lambda: client.get(reverse("live_results")),
+            "candidate_detail": lambda: client.get(self.random.choice(candidate_urls)),
+            "vote_post": post_vote,
+            "verify": lambda: client.get(
+                reverse("verify", args=[pending_tokens.pop()])
+            ),
+        }
+
+        return {
+            "config": {
+                key: options[key]
+                for key in ("players", "candidates", "votes", "unverified", "requests")
+            },
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+            },
+            "generated_at": timezone.now().isoformat(),
+            "generate_seconds": round(generate_seconds, 2),
+            "views": {
+                name: self.measure(scenario, requests)
+                for name, scenario in scenarios.items()
+            },
+        }
+
+    def measure(self, scenario, requests):
+        latencies = []
+        queries = []
+        statuses = set()
+        for _ in range(requests):
+            with CaptureQueriesContext(connection) as captured:
+                start = perf_counter()
+                response = scenario()
+                latencies.append((perf_counter() - start) * 1000)
+            queries.append(len(captured))
+            statuses.add(response.status_code)
+
+        # One extra run under tracemalloc, so its overhead stays out of the timings
+        tracemalloc.start()
+        scenario()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        return {
+            "latency_ms": percentiles(latencies),
+            "cold_ms": round(latencies[0], 2),
+            "queries": percentiles(queries),
+            "peak_memory_kb": round(peak / 1024, 1),
+            "status_codes": sorted(statuses),
+        }
+
+    def generate(self, year, options):
+        """Bulk-insert players, candidates and votes; return candidates and tokens."""
+        rand = self.random
+        clubs = Club.objects.bulk_create([Club(name=f"Club {i}") for i in range(20)])
+        players = Player.objects.bulk_create(
+            [
+                Player(name=f"Player {i:05d}", country=rand.choice(COUNTRIES))
+                for i in range(options["players"])
+            ]
+        )
+        candidates = Candidate.objects.bulk_create(
+            [
+                Candidate(
+                    player=player,
+                    year=year,
+                    club=rand.choice(clubs),
+                    slug=f"player-{player.pk}",
+                )
+                for player in players[: options["candidates"]]
+            ]
+        )
+
+        player_weights = zipf_weights(len(candidates))
+        country_weights = zipf_weights(len(COUNTRIES))
+        # The verify scenario uses up one pending token per request, plus the
+        # tracemalloc run
+        pending = max(
+            int(options["votes"] * options["unverified"]), options["requests"] + 1
+        )
+        total = options["votes"] + pending
+        pending_tokens = []
+        batch = []
+        for i in range(total):
+            picks = []
+            while len(picks) < 3:
+                pick = rand.choices(candidates, player_weights)[0].player_id
+                if pick not in picks:
+                    picks.append(pick)
+            verified = i < options["votes"]
+            token = "" if verified else uuid.uuid4().hex
+            if token:
+                pending_tokens.append(token)
+            batch.append(
+                Vote(
+                    player_1st_id=picks[0],
+                    player_2nd_id=picks[1],
+                    player_3rd_id=picks[2],
+                    voter_country=rand.choices(COUNTRIES, country_weights)[0],
+                    email=f"voter{i}@example.com",
+                    year=year,
+                    is_verified=verified,
+                    token=token,
+                )
+            )
+            if len(batch) == 5000:
+                Vote.objects.bulk_create(batch)
+                batch = []
+        Vote.objects.bulk_create(batch)
+
+        rebuild_scores(year)
+        rand.shuffle(pending_tokens)
+        return candidates, pending_tokens
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from ballon_dor.exports import FORMATS, export_votes
+from ballon_dor.utils import get_active_year
+
+
+class Command(BaseCommand):
+    help = "Stream a year's votes to a CSV or NDJSON file without loading them all."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="File to write.")
+        parser.add_argument(
+            "--year", type=int, help="Defaults to the active election year."
+        )
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output.")
+        parser.add_argument(
+            "--verified-only", action="store_true", help="Skip unverified votes."
+        )
+
+    def handle(self, *args, **options):
+        year = options["year"] or get_active_year()
+        written = 0
+        with open(options["output"], "wb") as f:
+            for chunk in export_votes(
+                year, options["format"], options["gzip"], options["verified_only"]
+            ):
+                f.write(chunk)
+                written += len(chunk)
+        self.stdout.write(f"{year}: wrote {written} bytes to {options['output']}")
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ballon_dor.scoring import finalize_results
+from ballon_dor.utils import get_active_year, is_voting_closed
+
+
+class Command(BaseCommand):
+    help = "Freeze a closed election's winner and totals (run at the deadline)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--year", type=int, help="Defaults to the active election year."
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Finalize even though voting for the year is still open.",
+        )
+
+    def handle(self, *args, **options):
+        year = options["year"] or get_active_year()
+        if not is_voting_closed(year) and not options["force"]:
+            raise CommandError(f"Voting for {year} is still open (use --force).")
+
+        result = finalize_results(year)
+        winner = result.winner.player.name if result.winner else "no winner"
+        self.stdout.write(
+            f"{year}: {winner}, {result.points} points, "
+            f"{result.total_votes} votes from {result.countries} countries"
+        )
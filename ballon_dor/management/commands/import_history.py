@@ -0,0 +1,35 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ballon_dor.importer import CatalogImportError, import_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert players, clubs, national teams, candidates and Ballon d'Or "
+        "results from dumpdata JSON files, in bulk. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "files",
+            nargs="+",
+            help="dumpdata JSON files; later files override earlier ones by pk.",
+        )
+
+    def handle(self, *args, **options):
+        records = []
+        for path in options["files"]:
+            with open(path, encoding="utf-8") as f:
+                records.extend(json.load(f))
+
+        try:
+            counts, skipped = import_catalog(records)
+        except CatalogImportError as e:
+            raise CommandError(str(e))
+
+        for label, count in counts.items():
+            self.stdout.write(f"{label}: {count}")
+        if skipped:
+            self.stdout.write(f"skipped {skipped} records of other models")
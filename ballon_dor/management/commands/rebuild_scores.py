@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from ballon_dor.models import PlayerYearScore, Vote
+from ballon_dor.scoring import rebuild_scores, score_mismatches
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-player score table from verified votes, or check it."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--year",
+            type=int,
+            action="append",
+            help="Year to process (repeatable). Defaults to every year with votes.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare the stored tally with the votes; exit non-zero on drift.",
+        )
+
+    def handle(self, *args, **options):
+        years = options["year"] or sorted(
+            set(Vote.objects.values_list("year", flat=True).distinct())
+            | set(PlayerYearScore.objects.values_list("year", flat=True).distinct())
+        )
+
+        drifted = []
+        for year in years:
+            if options["check"]:
+                mismatches = score_mismatches(year)
+                for player_id, stored, expected in mismatches:
+                    self.stdout.write(
+                        f"{year} player {player_id}: stored={stored} expected={expected}"
+                    )
+                if mismatches:
+                    drifted.append(year)
+                else:
+                    self.stdout.write(f"{year}: OK")
+            else:
+                count = rebuild_scores(year)
+                self.stdout.write(f"{year}: rebuilt {count} player scores")
+
+        if drifted:
+            raise CommandError(
+                "Score table out of sync for: " + ", ".join(map(str, drifted))
+            )
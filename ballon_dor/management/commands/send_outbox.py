@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from ballon_dor.emails import MAX_ATTEMPTS, send_batch
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the outbox over one SMTP connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, polling for new emails every --interval seconds.",
+        )
+        parser.add_argument("--interval", type=float, default=2.0)
+
+    def handle(self, *args, **options):
+        while True:
+            # Drain everything that's due before sleeping
+            while True:
+                sent, failed = send_batch(
+                    options["batch_size"], options["max_attempts"]
+                )
+                if sent or failed:
+                    self.stdout.write(f"sent {sent}, failed {failed}")
+                if sent + failed < options["batch_size"]:
+                    break
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is already imported or connected.
+BOOT_SCRIPT = """
+import json, os, sys, time
+
+start = time.perf_counter()
+import django
+from django.conf import settings
+
+settings.INSTALLED_APPS  # import the settings module
+timings = {"settings_ms": time.perf_counter() - start}
+
+mark = time.perf_counter()
+django.setup()
+timings["setup_ms"] = time.perf_counter() - mark
+
+mark = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+timings["urlconf_ms"] = time.perf_counter() - mark
+
+mark = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+timings["wsgi_ms"] = time.perf_counter() - mark
+
+status = None
+path = sys.argv[1]
+if path:
+    from django.test import Client
+
+    mark = time.perf_counter()
+    response = Client(HTTP_HOST="fansaward.com").get(path)
+    status = response.status_code
+    timings["first_request_ms"] = time.perf_counter() - mark
+
+timings = {key: round(value * 1000, 1) for key, value in timings.items()}
+timings["time_to_first_request_ms"] = round(
+    (time.perf_counter() - start) * 1000, 1
+)
+timings["status"] = status
+print(json.dumps(timings))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start: import time, django.setup(), URLconf loading and "
+        "the first request, in a fresh interpreter. Prints JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default="/",
+            help="URL to request after boot. Pass an empty string to skip it.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="How many of the slowest imports to report.",
+        )
+        parser.add_argument(
+            "--max-ms",
+            type=float,
+            help="Fail if time to first request exceeds this many milliseconds.",
+        )
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT, options["path"]],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Boot failed:\n{result.stderr[-2000:]}")
+
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        report["slowest_imports"] = self.slowest_imports(result.stderr, options["top"])
+        self.stdout.write(json.dumps(report, indent=2))
+
+        if options["max_ms"] and report["time_to_first_request_ms"] > options["max_ms"]:
+            raise CommandError(
+                f"Time to first request {report['time_to_first_request_ms']}ms "
+                f"exceeds {options['max_ms']}ms"
+            )
+
+    def slowest_imports(self, stderr, top):
+        """Top-level packages by cumulative import time (from -X importtime)."""
+        packages = {}
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            if not cumulative.strip().isdigit():
+                continue  # header row
+            # Only count top-level imports; nested ones are already included
+            if name.startswith("  "):
+                continue
+            package = name.strip().split(".")[0]
+            packages[package] = packages.get(package, 0) + int(cumulative)
+        ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        return [
+            {"module": package, "cumulative_ms": round(us / 1000, 1)}
+            for package, us in ranked[:top]
+        ]
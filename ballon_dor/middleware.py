@@ -0,0 +1,148 @@
+"""
+Opt-in per-request performance instrumentation.
+
+Enable with ``PERF_INSTRUMENTATION=True``. Each response then gets a
+``Server-Timing`` header (SQL time and count, template render time, total),
+and a rolling window of samples per URL name is kept in memory for the
+staff-only performance endpoint. When disabled the middleware removes itself
+at startup, so it costs nothing.
+"""
+
+import heapq
+import threading
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+WINDOW_SIZE = 500
+SLOWEST_KEPT = 5
+
+
+class RequestStats:
+    """``connection.execute_wrapper`` that times every statement of a request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.slowest = []  # min-heap of (duration, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - start
+            self.queries += 1
+            self.db_time += duration
+            if len(self.slowest) < SLOWEST_KEPT:
+                heapq.heappush(self.slowest, (duration, sql))
+            elif duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (duration, sql))
+
+
+class PerformanceLog:
+    """Rolling window of request samples per URL name, safe across threads."""
+
+    def __init__(self, window_size=WINDOW_SIZE):
+        self.window_size = window_size
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.samples = defaultdict(lambda: deque(maxlen=self.window_size))
+            self.slowest = defaultdict(list)
+
+    def record(self, url_name, total, stats):
+        with self.lock:
+            self.samples[url_name].append(
+                (total, stats.db_time, stats.queries, stats.render_time)
+            )
+            slowest = self.slowest[url_name]
+            for item in stats.slowest:
+                if len(slowest) < SLOWEST_KEPT:
+                    heapq.heappush(slowest, item)
+                elif item[0] > slowest[0][0]:
+                    heapq.heapreplace(slowest, item)
+
+    def summary(self):
+        with self.lock:
+            samples = {name: list(window) for name, window in self.samples.items()}
+            slowest = {
+                name: sorted(items, reverse=True)
+                for name, items in self.slowest.items()
+            }
+
+        return {
+            name: {
+                "requests": len(window),
+                "total_ms": _percentiles([s[0] for s in window]),
+                "sql_ms": _percentiles([s[1] for s in window]),
+                "queries": _percentiles([s[2] for s in window], scale=1),
+                "render_ms": _percentiles([s[3] for s in window]),
+                "slowest_queries": [
+                    {"ms": round(duration * 1000, 2), "sql": sql}
+                    for duration, sql in slowest.get(name, [])
+                ],
+            }
+            for name, window in samples.items()
+        }
+
+
+def _percentiles(values, scale=1000):
+    values = sorted(values)
+    last = len(values) - 1
+
+    def pick(fraction):
+        return round(values[round(fraction * last)] * scale, 2)
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+performance_log = PerformanceLog()
+
+
+class QueryTimingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "PERF_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        request._performance_stats = stats
+        start = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = perf_counter() - start
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+                f"render;dur={stats.render_time * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ]
+        )
+
+        match = request.resolver_match
+        if match and match.view_name:
+            performance_log.record(match.view_name, total, stats)
+        return response
+
+    def process_template_response(self, request, response):
+        # Rendering happens right after this hook; time it with a callback
+        stats = request._performance_stats
+        start = perf_counter()
+
+        def rendered(response):
+            stats.render_time += perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+        return response
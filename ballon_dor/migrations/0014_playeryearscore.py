@@ -0,0 +1,82 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_scores(apps, schema_editor):
+    Vote = apps.get_model("ballon_dor", "Vote")
+    PlayerYearScore = apps.get_model("ballon_dor", "PlayerYearScore")
+    positions = {
+        "player_1st": ("first_votes", 5),
+        "player_2nd": ("second_votes", 3),
+        "player_3rd": ("third_votes", 1),
+    }
+
+    scores = {}
+    for field, (counter, points) in positions.items():
+        rows = (
+            Vote.objects.filter(is_verified=True)
+            .values("year", field)
+            .annotate(n=Count("id"))
+        )
+        for row in rows:
+            key = (row["year"], row[field])
+            score = scores.setdefault(
+                key, PlayerYearScore(year=row["year"], player_id=row[field])
+            )
+            setattr(score, counter, row["n"])
+            score.points += row["n"] * points
+
+    PlayerYearScore.objects.bulk_create(scores.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ballon_dor", "0013_alter_candidate_image_alter_club_logo_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayerYearScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveIntegerField()),
+                ("first_votes", models.PositiveIntegerField(default=0)),
+                ("second_votes", models.PositiveIntegerField(default=0)),
+                ("third_votes", models.PositiveIntegerField(default=0)),
+                ("points", models.PositiveIntegerField(default=0)),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="year_scores",
+                        to="ballon_dor.player",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["year", "-points"], name="score_year_points_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("year", "player"), name="unique_score_player_per_year"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ballon_dor", "0015_outboxemail"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vote",
+            index=models.Index(
+                condition=models.Q(("is_verified", False)),
+                fields=["token"],
+                name="vote_pending_token_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ballon_dor", "0016_vote_pending_token_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vote",
+            index=models.Index(
+                condition=models.Q(("is_verified", True)),
+                fields=["year", "player_1st"],
+                name="vote_verified_1st_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vote",
+            index=models.Index(
+                condition=models.Q(("is_verified", True)),
+                fields=["year", "player_2nd"],
+                name="vote_verified_2nd_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vote",
+            index=models.Index(
+                condition=models.Q(("is_verified", True)),
+                fields=["year", "player_3rd"],
+                name="vote_verified_3rd_idx",
+            ),
+        ),
+    ]
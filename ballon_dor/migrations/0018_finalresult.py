@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ballon_dor", "0017_vote_verified_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FinalResult",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveIntegerField(unique=True)),
+                ("points", models.PositiveIntegerField(default=0)),
+                ("first_place_votes", models.PositiveIntegerField(default=0)),
+                ("total_votes", models.PositiveIntegerField(default=0)),
+                ("countries", models.PositiveIntegerField(default=0)),
+                ("finalized_at", models.DateTimeField(auto_now=True)),
+                (
+                    "winner",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="ballon_dor.candidate",
+                    ),
+                ),
+            ],
+        ),
+    ]
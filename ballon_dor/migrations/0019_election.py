@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ballon_dor", "0018_finalresult"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Election",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveIntegerField(unique=True)),
+                (
+                    "opens_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Leave blank to open right away.",
+                        null=True,
+                    ),
+                ),
+                ("closes_at", models.DateTimeField()),
+                ("points_1st", models.PositiveSmallIntegerField(default=5)),
+                ("points_2nd", models.PositiveSmallIntegerField(default=3)),
+                ("points_3rd", models.PositiveSmallIntegerField(default=1)),
+                (
+                    "is_finalized",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Set once the final result has been stored.",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator, MaxValueValidator
 from cloudinary.models import CloudinaryField
@@ -167,6 +168,150 @@ class Vote(models.Model):
                 fields=["year", "email"], name="unique_email_per_year"
             )
         ]
+        indexes = [
+            # Verification links only ever look up votes that are still pending
+            models.Index(
+                fields=["token"],
+                name="vote_pending_token_idx",
+                condition=models.Q(is_verified=False),
+            ),
+            # Tallies only count verified votes, per year and pick position
+            models.Index(
+                fields=["year", "player_1st"],
+                name="vote_verified_1st_idx",
+                condition=models.Q(is_verified=True),
+            ),
+            models.Index(
+                fields=["year", "player_2nd"],
+                name="vote_verified_2nd_idx",
+                condition=models.Q(is_verified=True),
+            ),
+            models.Index(
+                fields=["year", "player_3rd"],
+                name="vote_verified_3rd_idx",
+                condition=models.Q(is_verified=True),
+            ),
+        ]
 
     def __str__(self):
         return f"Vote: 1st-{self.player_1st.name}, 2nd-{self.player_2nd.name}, 3rd-{self.player_3rd.name}"
+
+
+class PlayerYearScore(models.Model):
+    """
+    Running tally of verified votes for one player in one year.
+
+    Rows are incremented when a vote is verified, so results pages read one
+    row per candidate instead of re-counting every vote. See
+    ``ballon_dor.scoring`` for the helpers that maintain and read it.
+    """
+
+    player = models.ForeignKey(
+        Player, on_delete=models.CASCADE, related_name="year_scores"
+    )
+    year = models.PositiveIntegerField()
+    first_votes = models.PositiveIntegerField(default=0)
+    second_votes = models.PositiveIntegerField(default=0)
+    third_votes = models.PositiveIntegerField(default=0)
+    points = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["year", "player"], name="unique_score_player_per_year"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["year", "-points"], name="score_year_points_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.player.name} ({self.year}): {self.points} pts"
+
+
+class Election(models.Model):
+    """
+    Dates and points scheme for one year's fan vote.
+
+    Views don't query this table: ``utils.get_election_config`` snapshots
+    every row once per process and reloads when one is saved. A year without
+    a row closes on 21 September 23:59:59 UTC and awards 5/3/1 points.
+    """
+
+    DEFAULT_POINTS = (5, 3, 1)
+
+    year = models.PositiveIntegerField(unique=True)
+    opens_at = models.DateTimeField(
+        null=True, blank=True, help_text="Leave blank to open right away."
+    )
+    closes_at = models.DateTimeField()
+    points_1st = models.PositiveSmallIntegerField(default=DEFAULT_POINTS[0])
+    points_2nd = models.PositiveSmallIntegerField(default=DEFAULT_POINTS[1])
+    points_3rd = models.PositiveSmallIntegerField(default=DEFAULT_POINTS[2])
+    is_finalized = models.BooleanField(
+        default=False, help_text="Set once the final result has been stored."
+    )
+
+    def __str__(self):
+        return f"{self.year} election"
+
+
+class FinalResult(models.Model):
+    """
+    The fan vote's outcome for a year, frozen once voting has closed.
+
+    Written only by the ``finalize_results`` command (run at the deadline),
+    so the winner card is a single row lookup instead of aggregates over
+    every vote. Until then ``scoring.get_final_result`` shows an unsaved,
+    cached result computed from the score table.
+    """
+
+    year = models.PositiveIntegerField(unique=True)
+    # Null when nobody received a verified vote
+    winner = models.ForeignKey(
+        Candidate, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    points = models.PositiveIntegerField(default=0)
+    first_place_votes = models.PositiveIntegerField(default=0)
+    total_votes = models.PositiveIntegerField(default=0)
+    countries = models.PositiveIntegerField(default=0)
+    finalized_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.year} final result"
+
+
+class OutboxEmail(models.Model):
+    """
+    An email waiting to be sent by the ``send_outbox`` worker.
+
+    Rows are written in the same transaction as the data they describe, so a
+    request never waits on the mail server and no email is lost if it's down.
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    ]
+
+    to = models.EmailField()
+    subject = models.CharField(max_length=200)
+    html_body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to} ({self.status})"
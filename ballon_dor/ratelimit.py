@@ -0,0 +1,174 @@
+"""
+Token-bucket rate limiting for the vote and verification endpoints.
+
+Each rule keeps one bucket per key (client IP, email domain). A bucket holds
+up to ``burst`` tokens and refills at ``per_minute`` tokens a minute; every
+request takes a token, and one that finds the bucket empty is answered with
+429 before the view builds a form or touches the database.
+
+Buckets live in this process by default (``RATE_LIMIT_BACKEND = "memory"``),
+or in Django's cache (``"cache"``) so that every worker shares them.
+"""
+
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+MAX_BUCKETS = 10_000
+
+
+class MemoryBuckets:
+    """
+    Buckets in a plain dict, shared by the threads of one process.
+
+    There is no lock: every update replaces a single tuple, so a lost race
+    can only let one extra request through. Once the dict outgrows
+    ``max_buckets`` it drops buckets that have refilled (they behave exactly
+    like new ones), then the least recently used, so a flood of distinct IPs
+    can't grow it without bound.
+    """
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, max_buckets=MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self.buckets = {}
+
+    def take(self, key, burst, per_second, now):
+        tokens, updated, _ = self.buckets.get(key, (burst, now, now))
+        tokens = min(burst, tokens + (now - updated) * per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        full_at = now + (burst - tokens) / per_second
+        self.buckets[key] = (tokens, now, full_at)
+        if len(self.buckets) > self.max_buckets:
+            self.evict(now)
+        return allowed, tokens
+
+    def evict(self, now):
+        items = list(self.buckets.items())
+        for key, (_, _, full_at) in items:
+            if full_at <= now:
+                self.buckets.pop(key, None)
+        if len(self.buckets) > self.max_buckets // 2:
+            # Still crowded: keep the most recently used half
+            items.sort(key=lambda item: item[1][1])
+            for key, _ in items[: len(items) - self.max_buckets // 2]:
+                self.buckets.pop(key, None)
+
+    def clear(self):
+        self.buckets.clear()
+
+
+class CacheBuckets:
+    """
+    Buckets in Django's cache, shared by every worker.
+
+    Entries expire once they would have refilled, so the cache only holds
+    recently active keys. Reads and writes aren't atomic across workers;
+    concurrent requests for one key can each spend the same token.
+
+    Timestamps are wall-clock time: monotonic clocks of different hosts
+    can't be compared. Small skew between hosts is treated as no time passed.
+    """
+
+    clock = staticmethod(time.time)
+
+    def take(self, key, burst, per_second, now):
+        cache_key = f"ballon_dor:ratelimit:{key}"
+        tokens, updated = cache.get(cache_key, (burst, now))
+        tokens = min(burst, tokens + max(0, now - updated) * per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        timeout = math.ceil((burst - tokens) / per_second) + 1
+        cache.set(cache_key, (tokens, now), timeout=timeout)
+        return allowed, tokens
+
+    def clear(self):
+        pass
+
+
+memory_buckets = MemoryBuckets()
+
+
+def get_buckets():
+    if settings.RATE_LIMIT_BACKEND == "cache":
+        return CacheBuckets()
+    return memory_buckets
+
+
+def reset():
+    """Forget every in-process bucket (tests start from full buckets)."""
+    memory_buckets.clear()
+
+
+def client_ip(request):
+    if settings.RATE_LIMIT_BEHIND_PROXY:
+        # The proxy appends the address it saw; earlier entries are client-supplied
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        if forwarded:
+            return forwarded.rsplit(",", 1)[-1].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def email_domain(request):
+    """The submitted email's domain, or None for the big shared webmail hosts."""
+    domain = request.POST.get("email", "").rpartition("@")[2].strip().lower()
+    if domain in settings.RATE_LIMIT_EXEMPT_DOMAINS:
+        return None
+    return domain or None
+
+
+def check(request, rules, now=None):
+    """
+    Take a token from each rule's bucket; return seconds to wait, or 0.
+
+    ``rules`` are ``(limit name, key function)`` pairs; the limit's
+    ``(burst, per_minute)`` comes from ``settings.RATE_LIMITS``. A rule whose
+    key function returns None (e.g. no email submitted) doesn't apply.
+    """
+    buckets = get_buckets()
+    now = buckets.clock() if now is None else now
+    for name, key_func in rules:
+        key = key_func(request)
+        if not key:
+            continue
+        burst, per_minute = settings.RATE_LIMITS[name]
+        per_second = per_minute / 60
+        allowed, tokens = buckets.take(f"{name}:{key}", burst, per_second, now)
+        if not allowed:
+            return math.ceil((1 - tokens) / per_second)
+    return 0
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse(
+        "Too many requests. Please try again in a moment.",
+        status=429,
+        content_type="text/plain",
+    )
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
+def rate_limit(*rules, methods=("POST",)):
+    """Reject ``methods`` requests over any of ``rules`` before the view runs."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if settings.RATE_LIMIT_ENABLED and request.method in methods:
+                retry_after = check(request, rules)
+                if retry_after:
+                    return too_many_requests(retry_after)
+            return view(request, *args, **kwargs)
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,126 @@
+"""
+Read-replica routing for the read-only pages.
+
+Every query goes to ``default`` unless the request is a GET or HEAD to a view
+marked with ``@read_replica``. ``ReplicaMiddleware`` then sends that request's
+ballon_dor reads to ``settings.REPLICA_DATABASE``. Sessions, users and
+everything written are left on the primary, and so is anything read after a
+write in the same request.
+
+A replica can lag behind by up to ``REPLICA_PIN_SECONDS``, so:
+
+* the request right after a vote is verified uses the primary.
+  ``pin_to_primary()`` sets a short-lived cookie, and pinned requests skip
+  the replica, so voters see their own vote on the live results.
+* tallies computed from the replica are cached only for that long, and
+  primary readers don't reuse them (see ``caching.cached_result``).
+* catalog values, the search index and the election snapshot are rarely
+  rebuilt and always read from the primary (``primary_reads()``). A lagging
+  read there would be stored under the new version.
+
+With no replica configured, everything goes to ``default`` as before.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = "pin_primary"
+ROUTED_APPS = {"ballon_dor"}
+SAFE_METHODS = ("GET", "HEAD")
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_alias():
+    """The configured replica alias, or ``None`` when there isn't one."""
+    return getattr(settings, "REPLICA_DATABASE", None)
+
+
+def replica_reads_enabled():
+    """True when ballon_dor reads here would go to a configured replica."""
+    return _replica_reads.get() and replica_alias() is not None
+
+
+@contextmanager
+def _reading_from_replica(enabled):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_reads():
+    """Send ballon_dor reads inside the block to the replica, if configured."""
+    return _reading_from_replica(True)
+
+
+def primary_reads():
+    """Keep reads inside the block on the primary, even in a replica view."""
+    return _reading_from_replica(False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and model._meta.app_label in ROUTED_APPS:
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Reads after a write in the same request must see it
+        _replica_reads.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def read_replica(view_func):
+    """Mark a view whose GET/HEAD reads may be served by the replica."""
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        return view_func(*args, **kwargs)
+
+    wrapper.read_replica = True
+    return wrapper
+
+
+def pin_to_primary(response):
+    """Keep this client's next requests on the primary for a few seconds."""
+    response.set_cookie(
+        PIN_COOKIE,
+        "1",
+        max_age=settings.REPLICA_PIN_SECONDS,
+        httponly=True,
+        samesite="Lax",
+    )
+    return response
+
+
+class ReplicaMiddleware:
+    """Enable replica reads for marked views, including template rendering."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with primary_reads():
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            getattr(view_func, "read_replica", False)
+            and replica_alias()
+            and request.method in SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+        ):
+            # Reset by __call__ once the response (and its template) is done
+            _replica_reads.set(True)
@@ -0,0 +1,252 @@
+"""
+Points and rankings for the fan vote.
+
+Every results page goes through this module so the points scheme and the
+ranking rules live in one place. Live standings are read from the
+``PlayerYearScore`` table; ``tally_votes`` recomputes them from raw votes.
+"""
+
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Window
+from django.db.models.functions import Coalesce, Rank
+
+from .caching import bump_results_version, cached_result
+from .models import Candidate, Election, FinalResult, Player, PlayerYearScore, Vote
+from .utils import get_election
+
+# Vote field -> PlayerYearScore counter
+POSITIONS = {
+    "player_1st": "first_votes",
+    "player_2nd": "second_votes",
+    "player_3rd": "third_votes",
+}
+
+
+def position_points(year):
+    """(vote field, counter, points) per pick, from the year's Election."""
+    return [
+        (field, counter, points)
+        for (field, counter), points in zip(
+            POSITIONS.items(), get_election(year).points
+        )
+    ]
+
+
+def _position_count(field, year):
+    """Correlated subquery counting a player's verified votes in one position."""
+    votes = (
+        Vote.objects.filter(year=year, is_verified=True, **{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return Coalesce(Subquery(votes), 0)
+
+
+def tally_votes(year):
+    """
+    Count verified votes per player straight from the ``Vote`` table.
+
+    Runs as a single query and returns unsaved ``PlayerYearScore`` objects
+    keyed by player id, for players with at least one vote.
+    """
+    # Player already has first_votes/... reverse relations, hence the prefix
+    counters = {
+        f"n_{counter}": _position_count(field, year)
+        for field, counter in POSITIONS.items()
+    }
+    points = sum(
+        F(f"n_{counter}") * value for _, counter, value in position_points(year)
+    )
+    rows = (
+        Player.objects.annotate(**counters)
+        .annotate(points=points)
+        .filter(points__gt=0)
+        .values_list("pk", *counters, "points")
+    )
+    return {
+        player_id: PlayerYearScore(
+            player_id=player_id,
+            year=year,
+            first_votes=first,
+            second_votes=second,
+            third_votes=third,
+            points=total,
+        )
+        for player_id, first, second, third, total in rows
+    }
+
+
+def ranked_scores(year, limit=None):
+    """
+    Return the year's ``PlayerYearScore`` rows, best first, in one query.
+
+    Each row gets a ``rank`` computed by the database's RANK() window, so tied
+    players share a rank. ``limit`` is applied in SQL after ranking.
+    """
+    scores = (
+        PlayerYearScore.objects.filter(year=year, points__gt=0)
+        .select_related("player")
+        .annotate(rank=Window(Rank(), order_by=F("points").desc()))
+        .order_by("-points", "player__name")
+    )
+    if limit is not None:
+        scores = scores[:limit]
+    return list(scores)
+
+
+def player_standing(year, player_id):
+    """
+    Return one player's ``PlayerYearScore`` row with its ``rank``, or ``None``.
+
+    The rank is ``1 + number of players with more points``, counted on the
+    ``(year, points)`` index, so the lookup costs one query regardless of how
+    many players or votes the year has. Ties share a rank, as in
+    ``ranked_scores``.
+    """
+    higher = (
+        PlayerYearScore.objects.filter(year=year, points__gt=OuterRef("points"))
+        .order_by()
+        .values("year")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return (
+        PlayerYearScore.objects.filter(year=year, player_id=player_id, points__gt=0)
+        .annotate(rank=Coalesce(Subquery(higher), 0) + 1)
+        .first()
+    )
+
+
+def total_verified_votes(year):
+    """Number of verified votes, read from the score table (one 1st pick each)."""
+    totals = PlayerYearScore.objects.filter(year=year).aggregate(
+        total=Sum("first_votes")
+    )
+    return totals["total"] or 0
+
+
+def compute_final_result(year):
+    """Build (unsaved) the year's FinalResult from the score table."""
+    result = FinalResult(year=year, total_votes=total_verified_votes(year))
+    top_scores = ranked_scores(year, limit=1)
+    if top_scores:
+        top_score = top_scores[0]
+        result.winner = (
+            Candidate.objects.filter(year=year, player_id=top_score.player_id)
+            .select_related("player", "club")
+            .first()
+        )
+        result.points = top_score.points
+        result.first_place_votes = top_score.first_votes
+        result.countries = (
+            Vote.objects.filter(year=year, is_verified=True)
+            .exclude(voter_country="")
+            .values("voter_country")
+            .distinct()
+            .count()
+        )
+    return result
+
+
+def finalize_results(year):
+    """(Re)compute and store the year's FinalResult."""
+    result = compute_final_result(year)
+    fields = ("winner", "points", "first_place_votes", "total_votes", "countries")
+    stored, _ = FinalResult.objects.update_or_create(
+        year=year, defaults={field: getattr(result, field) for field in fields}
+    )
+    # Saved one by one so the Election signal refreshes every snapshot
+    for election in Election.objects.filter(year=year, is_finalized=False):
+        election.is_finalized = True
+        election.save(update_fields=["is_finalized"])
+    return stored
+
+
+def get_final_result(year):
+    """
+    The stored FinalResult for ``year``; never writes.
+
+    Until ``manage.py finalize_results`` has stored it, an unsaved result is
+    computed from the score table (cached per results version). Only call
+    this once voting for ``year`` has closed.
+    """
+    result = (
+        FinalResult.objects.select_related("winner__player", "winner__club")
+        .filter(year=year)
+        .first()
+    )
+    if result is None:
+        result = cached_result(year, "final_result", lambda: compute_final_result(year))
+    return result
+
+
+# Namespace for the per-year advisory locks on PlayerYearScore
+SCORE_LOCK_KEY = 19_001
+
+
+def _lock_year_scores(year, exclusive=False):
+    """
+    Hold a per-year lock on the score table until the transaction ends.
+
+    Recording a vote takes it shared, so verifications don't wait on each
+    other; a rebuild takes it exclusively, so no vote is verified between
+    its tally and its rewrite. PostgreSQL only: SQLite already serializes
+    writers, and a stale read there fails with "database is locked".
+    """
+    if connection.vendor != "postgresql":
+        return
+    function = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {function}(%s, %s)", [SCORE_LOCK_KEY, year])
+
+
+def record_vote(vote):
+    """Add a freshly verified vote to the tally (call inside a transaction)."""
+    _lock_year_scores(vote.year)
+    PlayerYearScore.objects.bulk_create(
+        [
+            PlayerYearScore(player_id=getattr(vote, f"{field}_id"), year=vote.year)
+            for field in POSITIONS
+        ],
+        ignore_conflicts=True,
+    )
+    for field, counter, points in position_points(vote.year):
+        PlayerYearScore.objects.filter(
+            player_id=getattr(vote, f"{field}_id"), year=vote.year
+        ).update(**{counter: F(counter) + 1, "points": F("points") + points})
+
+
+def rebuild_scores(year):
+    """Replace the stored tally for ``year`` with one computed from votes."""
+    with transaction.atomic():
+        # Tally and rewrite under one lock: no vote can slip in between
+        _lock_year_scores(year, exclusive=True)
+        scores = tally_votes(year)
+        PlayerYearScore.objects.filter(year=year).delete()
+        PlayerYearScore.objects.bulk_create(scores.values())
+        # Cached tallies and page ETags move on once the new rows are visible
+        transaction.on_commit(lambda: bump_results_version(year))
+    return len(scores)
+
+
+def score_mismatches(year):
+    """Return ``(player_id, stored, expected)`` for rows that disagree."""
+    expected = {
+        player_id: (s.first_votes, s.second_votes, s.third_votes, s.points)
+        for player_id, s in tally_votes(year).items()
+    }
+    stored = {
+        row[0]: row[1:]
+        for row in PlayerYearScore.objects.filter(year=year)
+        .exclude(points=0)
+        .values_list(
+            "player_id", "first_votes", "second_votes", "third_votes", "points"
+        )
+    }
+    return [
+        (player_id, stored.get(player_id), expected.get(player_id))
+        for player_id in sorted(set(expected) | set(stored))
+        if stored.get(player_id) != expected.get(player_id)
+    ]
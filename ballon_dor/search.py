@@ -0,0 +1,152 @@
+"""
+In-process candidate search.
+
+Names are accent-folded and tokenized ("Désiré Doué" -> ``desire``,
+``doue``), so searches ignore case and accents. Every query token must match
+a name token exactly, as a prefix (search-as-you-type) or within a small edit
+distance (typos). The index for a year is built once per process and rebuilt
+lazily when the catalog version changes (or after ``SNAPSHOT_TTL``), so
+lookups cost no database query.
+"""
+
+import bisect
+import time
+import unicodedata
+from collections import defaultdict, namedtuple
+
+from .caching import SNAPSHOT_TTL, get_catalog_version
+from .models import Candidate
+from .routers import primary_reads
+
+Entry = namedtuple("Entry", ["id", "name", "slug", "club", "country", "year"])
+
+EXACT, PREFIX, FUZZY = 0, 1, 2
+
+_indexes = {}
+
+
+def fold(text):
+    """Lowercase, strip accents and punctuation: ``"N'Golo Kanté"`` -> ``"n golo kante"``."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(
+        ch if ch.isalnum() else " "
+        for ch in decomposed
+        if not unicodedata.combining(ch)
+    )
+
+
+def tokenize(text):
+    return fold(text).split()
+
+
+def max_typos(token):
+    if len(token) < 4:
+        return 0
+    return 1 if len(token) < 8 else 2
+
+
+def edit_distance(a, b, limit):
+    """
+    Edit distance counting a swap of neighbouring letters as one typo, or
+    ``limit + 1`` as soon as it's known to exceed ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)
+            )
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class SearchIndex:
+    def __init__(self, entries):
+        self.entries = {entry.id: entry for entry in entries}
+        self.postings = defaultdict(set)
+        for entry in entries:
+            for token in tokenize(entry.name):
+                self.postings[token].add(entry.id)
+        self.vocabulary = sorted(self.postings)
+
+    @classmethod
+    def build(cls, year):
+        rows = Candidate.objects.filter(year=year).values_list(
+            "id", "player__name", "slug", "club__name", "player__country", "year"
+        )
+        return cls([Entry(*row) for row in rows])
+
+    def _matches(self, token):
+        """{candidate id: best match kind} for one query token."""
+        found = {}
+
+        def add(ids, kind):
+            for candidate_id in ids:
+                found[candidate_id] = min(kind, found.get(candidate_id, kind))
+
+        start = bisect.bisect_left(self.vocabulary, token)
+        for word in self.vocabulary[start:]:
+            if not word.startswith(token):
+                break
+            add(self.postings[word], EXACT if word == token else PREFIX)
+
+        limit = max_typos(token)
+        if limit:
+            for word in self.vocabulary:
+                # Compare against the word and, for partial input, its prefix
+                if (
+                    min(
+                        edit_distance(token, word, limit),
+                        edit_distance(token, word[: len(token)], limit),
+                    )
+                    <= limit
+                ):
+                    add(self.postings[word], FUZZY)
+        return found
+
+    def search(self, query, limit=None):
+        """Entries matching every token of ``query``, best matches first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        scores = None
+        for token in tokens:
+            matches = self._matches(token)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {
+                    candidate_id: scores[candidate_id] + kind
+                    for candidate_id, kind in matches.items()
+                    if candidate_id in scores
+                }
+        ranked = sorted(
+            (self.entries[candidate_id] for candidate_id in scores),
+            key=lambda entry: (scores[entry.id], entry.name),
+        )
+        return ranked[:limit] if limit else ranked
+
+
+def get_search_index(year):
+    """The year's index, rebuilt if candidates, players or clubs changed."""
+    version = get_catalog_version()
+    cached = _indexes.get(year)
+    if cached is None or cached[0] != version or time.monotonic() >= cached[2]:
+        with primary_reads():
+            index = SearchIndex.build(year)
+        cached = (version, index, time.monotonic() + SNAPSHOT_TTL)
+        _indexes[year] = cached
+    return cached[1]
+
+
+def clear_search_indexes():
+    _indexes.clear()
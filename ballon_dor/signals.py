@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .caching import bump_catalog_version, bump_election_version
+from .models import BallonDorResult, Candidate, Club, Election, NationalTeam, Player
+from .scoring import rebuild_scores
+from .utils import clear_election_config
+
+
+def catalog_changed(sender, **kwargs):
+    # After commit, so nobody caches the old rows under the new version
+    transaction.on_commit(bump_catalog_version)
+
+
+for model in (Player, Club, NationalTeam, Candidate, BallonDorResult):
+    post_save.connect(catalog_changed, sender=model)
+    post_delete.connect(catalog_changed, sender=model)
+
+
+def election_changed(sender, **kwargs):
+    # The active year is the latest candidate/election year, and the deadline
+    # and points come from Election rows
+    clear_election_config()
+    transaction.on_commit(bump_election_version)
+
+
+for model in (Candidate, Election):
+    post_save.connect(election_changed, sender=model)
+    post_delete.connect(election_changed, sender=model)
+
+
+POINT_FIELDS = ("points_1st", "points_2nd", "points_3rd")
+
+
+def _points(election):
+    return tuple(getattr(election, field) for field in POINT_FIELDS)
+
+
+def remember_points(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(POINT_FIELDS) & set(update_fields):
+        stored = _points(instance)  # e.g. finalize_results: points untouched
+    elif instance.pk:
+        stored = (
+            Election.objects.filter(pk=instance.pk).values_list(*POINT_FIELDS).first()
+        )
+    else:
+        stored = None
+    instance._stored_points = stored or Election.DEFAULT_POINTS
+
+
+def election_points_changed(sender, instance, **kwargs):
+    # Votes already counted used the old points; without a rebuild the
+    # stored tally would mix both schemes. Queued after the election version
+    # bump, so the rebuild reads the new points.
+    if kwargs.get("signal") is post_delete:
+        changed = _points(instance) != Election.DEFAULT_POINTS
+    else:
+        changed = _points(instance) != instance._stored_points
+    if changed:
+        transaction.on_commit(lambda: rebuild_scores(instance.year))
+
+
+pre_save.connect(remember_points, sender=Election)
+post_save.connect(election_points_changed, sender=Election)
+post_delete.connect(election_points_changed, sender=Election)
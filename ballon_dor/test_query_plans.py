@@ -0,0 +1,163 @@
+"""
+Query plan regression tests.
+
+Every statement the hot views issue is run through ``EXPLAIN`` (SQLite's
+``EXPLAIN QUERY PLAN`` or PostgreSQL's ``EXPLAIN (FORMAT JSON)``), and the
+test fails if any of them reads a large table without an index.
+"""
+
+import json
+import re
+import unittest
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import ratelimit
+from .emails import claim_batch
+from .models import Candidate, OutboxEmail, Player, PlayerYearScore, Vote
+from .scoring import tally_votes
+from .votes import verify_vote
+
+# Tables that grow with traffic; small lookup tables (players, clubs) may be scanned
+WATCHED_TABLES = {
+    model._meta.db_table for model in (Vote, PlayerYearScore, Candidate, OutboxEmail)
+}
+
+
+class QueryPlanTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.players = [
+            Player.objects.create(name=name, country="Testland")
+            for name in ("Messi", "Ronaldo", "Neymar")
+        ]
+        # A future year keeps voting open
+        self.candidates = [
+            Candidate.objects.create(player=player, year=2099)
+            for player in self.players
+        ]
+        for i in range(3):
+            Vote.objects.create(
+                player_1st=self.players[i],
+                player_2nd=self.players[(i + 1) % 3],
+                player_3rd=self.players[(i + 2) % 3],
+                email=f"voter{i}@example.com",
+                year=2099,
+                token=f"token-{i}",
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            verify_vote("token-0")
+
+    def capture(self, func):
+        """Run ``func`` and return the ``(sql, params)`` of every read it issued."""
+        statements = []
+
+        def wrapper(execute, sql, params, many, context):
+            if re.match(r"\s*(SELECT|UPDATE|DELETE)", sql, re.IGNORECASE):
+                statements.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(wrapper):
+            func()
+        self.assertTrue(statements, "nothing was captured")
+        return statements
+
+    def full_scans(self, sql, params):
+        if connection.vendor == "sqlite":
+            return self.sqlite_full_scans(sql, params)
+        if connection.vendor == "postgresql":
+            return self.postgresql_full_scans(sql, params)
+        raise unittest.SkipTest(f"No plan checks for {connection.vendor}")
+
+    def sqlite_full_scans(self, sql, params):
+        # Subqueries use aliases such as U0; map them back to table names
+        aliases = dict(
+            (alias, table) for table, alias in re.findall(r'"(\w+)" (U\d+|T\d+)\b', sql)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = [row[3] for row in cursor.fetchall()]
+        scans = []
+        for detail in plan:
+            match = re.match(r"SCAN (\w+)", detail)
+            if match and aliases.get(match[1], match[1]) in WATCHED_TABLES:
+                scans.append(detail)
+        return scans
+
+    def postgresql_full_scans(self, sql, params):
+        with connection.cursor() as cursor:
+            # Tiny test tables make seq scans look cheap; ask if an index path exists
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            cursor.execute("RESET enable_seqscan")
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        scans = []
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if (
+                node["Node Type"] == "Seq Scan"
+                and node.get("Relation Name") in WATCHED_TABLES
+            ):
+                scans.append(f"Seq Scan on {node['Relation Name']}")
+            nodes.extend(node.get("Plans", []))
+        return scans
+
+    def assertIndexedOnly(self, func):
+        for sql, params in self.capture(func):
+            scans = self.full_scans(sql, params)
+            self.assertEqual(scans, [], f"Full table scan in:\n{sql}")
+
+    def test_home_page(self):
+        self.assertIndexedOnly(lambda: self.client.get(reverse("home")))
+        self.assertIndexedOnly(
+            lambda: self.client.get(reverse("home"), {"search": "mes", "club": "X"})
+        )
+
+    def test_live_results(self):
+        self.assertIndexedOnly(lambda: self.client.get(reverse("live_results")))
+
+    def test_candidate_detail(self):
+        url = reverse("candidate_detail", args=[2099, self.candidates[0].slug])
+        self.assertIndexedOnly(lambda: self.client.get(url))
+
+    def test_vote_submission(self):
+        self.assertIndexedOnly(lambda: self.client.get(reverse("vote")))
+
+        # Submitting is one upsert on the (year, email) unique index plus the
+        # outbox insert, so there is no read left to plan
+        with CaptureQueriesContext(connection) as captured:
+            self.client.post(
+                reverse("vote"),
+                {
+                    "player_1st": self.players[0].id,
+                    "player_2nd": self.players[1].id,
+                    "player_3rd": self.players[2].id,
+                    "email": "voter1@example.com",
+                },
+            )
+        reads = [
+            query["sql"]
+            for query in captured.captured_queries
+            if re.match(r"\s*(SELECT|UPDATE|DELETE)", query["sql"], re.IGNORECASE)
+        ]
+        self.assertEqual(reads, [])
+
+    def test_verification(self):
+        self.assertIndexedOnly(
+            lambda: self.client.get(reverse("verify", args=["token-1"]))
+        )
+
+    def test_score_rebuild(self):
+        self.assertIndexedOnly(lambda: tally_votes(2099))
+
+    def test_outbox_claim(self):
+        self.assertIndexedOnly(lambda: claim_batch(50))
@@ -1,7 +1,85 @@
-from django.test import TestCase
-from django.urls import reverse
-from .models import Player, Club, NationalTeam, BallonDorResult, Vote, Candidate
-from .forms import VoteForm
+from asgiref.sync import sync_to_async
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import resolve, reverse
+from .models import (
+    Player,
+    Club,
+    NationalTeam,
+    BallonDorResult,
+    Vote,
+    Candidate,
+    PlayerYearScore,
+    OutboxEmail,
+    FinalResult,
+    Election,
+)
+from .forms import VoteForm, candidate_choices
+from .caching import (
+    SNAPSHOT_TTL,
+    bump_election_version,
+    bump_results_version,
+    cached_catalog,
+    cached_result,
+    get_results_version,
+)
+from .emails import send_batch
+from .importer import CatalogImportError, import_catalog
+from .facets import get_facets
+from .search import SearchIndex, clear_search_indexes, fold, get_search_index
+from .pagination import decode_cursor, encode_cursor, keyset_page
+from .middleware import performance_log
+from .routers import (
+    PIN_COOKIE,
+    ReplicaMiddleware,
+    ReplicaRouter,
+    pin_to_primary,
+    primary_reads,
+    read_replica,
+    replica_reads,
+)
+from . import ratelimit
+from .utils import (
+    get_active_year,
+    get_election,
+    get_voting_deadline,
+    is_voting_closed,
+    is_voting_open,
+)
+from .votes import submit_vote, verify_vote
+from .scoring import (
+    finalize_results,
+    player_standing,
+    ranked_scores,
+    rebuild_scores,
+    score_mismatches,
+    tally_votes,
+)
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections, router
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.core.management.base import CommandError
+from io import StringIO
+import asyncio
+import gzip
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 
 from django.utils import timezone
 from datetime import timedelta
@@ -33,6 +111,7 @@ class BallonDorModelTest(TestCase):
 
 class VoteTest(TestCase):
     def setUp(self):
+        ratelimit.reset()
         self.player1 = Player.objects.create(name="Messi", country="Argentina")
         self.player2 = Player.objects.create(name="Ronaldo", country="Portugal")
         self.player3 = Player.objects.create(name="Neymar", country="Brazil")
@@ -78,7 +157,7 @@ class VoteTest(TestCase):
                 "voter_country": "Testland",
             },
             **{"REMOTE_ADDR": "123.123.123.123"},
-            follow=False
+            follow=False,
         )
         self.assertRedirects(response1, reverse("live_results"))
 
@@ -93,7 +172,7 @@ class VoteTest(TestCase):
                 "voter_country": "Testland",
             },
             **{"REMOTE_ADDR": "123.123.123.123"},
-            follow=False
+            follow=False,
         )
         self.assertRedirects(response2, reverse("already_voted"))
 
@@ -111,7 +190,7 @@ class VoteTest(TestCase):
                     "voter_country": "Testland",
                 },
                 **{"REMOTE_ADDR": "124.124.124.124"},
-                follow=False
+                follow=False,
             )
             self.assertContains(response, "Voting has closed", status_code=200)
 
@@ -162,3 +241,1714 @@ class ViewTest(TestCase):
     def test_live_results_page_loads(self):
         response = self.client.get(reverse("live_results"))  # adjust name if different
         self.assertEqual(response.status_code, 200)
+
+
+class PlayerYearScoreTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.player1 = Player.objects.create(name="Messi", country="Argentina")
+        self.player2 = Player.objects.create(name="Ronaldo", country="Portugal")
+        self.player3 = Player.objects.create(name="Neymar", country="Brazil")
+        for player in (self.player1, self.player2, self.player3):
+            Candidate.objects.create(player=player, year=2025)
+
+    def create_vote(self, email, first, second, third, **kwargs):
+        return Vote.objects.create(
+            player_1st=first,
+            player_2nd=second,
+            player_3rd=third,
+            email=email,
+            year=2025,
+            token=email,
+            **kwargs,
+        )
+
+    def test_verify_increments_scores(self):
+        self.create_vote("a@example.com", self.player1, self.player2, self.player3)
+        self.create_vote("b@example.com", self.player2, self.player1, self.player3)
+
+        for token in ("a@example.com", "b@example.com"):
+            response = self.client.get(reverse("verify", args=[token]))
+            self.assertRedirects(response, reverse("live_results"))
+
+        score = PlayerYearScore.objects.get(year=2025, player=self.player1)
+        self.assertEqual(
+            (score.first_votes, score.second_votes, score.third_votes, score.points),
+            (1, 1, 0, 8),
+        )
+        score = PlayerYearScore.objects.get(year=2025, player=self.player3)
+        self.assertEqual((score.third_votes, score.points), (2, 2))
+        self.assertEqual(score_mismatches(2025), [])
+
+    def test_verify_twice_counts_once(self):
+        self.create_vote("a@example.com", self.player1, self.player2, self.player3)
+        self.client.get(reverse("verify", args=["a@example.com"]))
+        response = self.client.get(reverse("verify", args=["a@example.com"]))
+
+        self.assertContains(response, "Invalid or already verified link.")
+        score = PlayerYearScore.objects.get(year=2025, player=self.player1)
+        self.assertEqual(score.points, 5)
+
+    def test_verification_is_one_statement_on_votes(self):
+        self.create_vote("a@example.com", self.player1, self.player2, self.player3)
+
+        with CaptureQueriesContext(connection) as queries:
+            vote = verify_vote("a@example.com")
+
+        vote_queries = [
+            q["sql"] for q in queries.captured_queries if "ballon_dor_vote" in q["sql"]
+        ]
+        self.assertEqual(len(vote_queries), 1)
+        self.assertTrue(vote_queries[0].startswith("UPDATE"))
+        self.assertEqual(vote.player_1st_id, self.player1.id)
+        self.assertTrue(Vote.objects.get(email="a@example.com").is_verified)
+        self.assertIsNone(verify_vote("a@example.com"))
+
+    def test_rebuild_bumps_results_version(self):
+        version = get_results_version(2025)
+        with self.captureOnCommitCallbacks(execute=True):
+            rebuild_scores(2025)
+        self.assertNotEqual(get_results_version(2025), version)
+
+    def test_rebuild_tallies_inside_its_transaction(self):
+        # Votes verified between the tally and the rewrite would be lost
+        outer = len(connection.savepoint_ids)
+        depths = []
+
+        def tally(year):
+            depths.append(len(connection.savepoint_ids))
+            return {}
+
+        with patch("ballon_dor.scoring.tally_votes", side_effect=tally):
+            with patch("ballon_dor.scoring._lock_year_scores") as lock:
+                rebuild_scores(2025)
+        self.assertEqual(depths, [outer + 1])
+        lock.assert_called_once_with(2025, exclusive=True)
+
+    def test_rebuild_scores_command(self):
+        self.create_vote(
+            "a@example.com", self.player1, self.player2, self.player3, is_verified=True
+        )
+        self.create_vote("b@example.com", self.player3, self.player2, self.player1)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_scores", "--check", stdout=StringIO())
+
+        call_command("rebuild_scores", stdout=StringIO())
+        call_command("rebuild_scores", "--check", stdout=StringIO())
+
+        points = dict(
+            PlayerYearScore.objects.filter(year=2025).values_list("player", "points")
+        )
+        self.assertEqual(
+            points, {self.player1.id: 5, self.player2.id: 3, self.player3.id: 1}
+        )
+
+
+class ScoringTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.players = [
+            Player.objects.create(name=name, country="Testland")
+            for name in ("Messi", "Ronaldo", "Neymar", "Mbappe")
+        ]
+        for player in self.players:
+            Candidate.objects.create(player=player, year=2025)
+
+    def verify_votes(self, picks):
+        for first, second, third in picks:
+            i = Vote.objects.count()
+            vote = Vote.objects.create(
+                player_1st=self.players[first],
+                player_2nd=self.players[second],
+                player_3rd=self.players[third],
+                email=f"voter{i}@example.com",
+                year=2025,
+                token=f"token-{i}",
+            )
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.get(reverse("verify", args=[vote.token]))
+
+    def test_tally_votes_single_query(self):
+        self.verify_votes([(0, 1, 2), (1, 0, 3), (0, 2, 1)])
+
+        with self.assertNumQueries(1):
+            tally = tally_votes(2025)
+
+        self.assertEqual(
+            {player_id: score.points for player_id, score in tally.items()},
+            {
+                self.players[0].id: 13,
+                self.players[1].id: 9,
+                self.players[2].id: 4,
+                self.players[3].id: 1,
+            },
+        )
+
+    def test_ranked_scores_share_ranks_on_ties(self):
+        # Messi 5 + 3 = 8, Ronaldo 3 + 5 = 8, Neymar 1 + 1 = 2
+        self.verify_votes([(0, 1, 2), (1, 0, 2)])
+
+        scores = ranked_scores(2025)
+        self.assertEqual(
+            [(s.rank, s.player.name, s.points) for s in scores],
+            [(1, "Messi", 8), (1, "Ronaldo", 8), (3, "Neymar", 2)],
+        )
+        self.assertEqual(len(ranked_scores(2025, limit=1)), 1)
+
+    def test_live_results_query_count_is_constant(self):
+        self.verify_votes([(0, 1, 2)])
+        with CaptureQueriesContext(connection) as few_votes:
+            self.client.get(reverse("live_results"))
+
+        self.verify_votes([(i % 4, (i + 1) % 4, (i + 2) % 4) for i in range(1, 20)])
+        with CaptureQueriesContext(connection) as many_votes:
+            response = self.client.get(reverse("live_results"))
+
+        self.assertEqual(len(few_votes), len(many_votes))
+        self.assertEqual(response.context["total_votes"], 20)
+
+    def test_player_standing_matches_ranked_scores(self):
+        self.verify_votes([(0, 1, 2), (1, 0, 2), (3, 2, 0)])
+
+        for score in ranked_scores(2025):
+            with self.assertNumQueries(1):
+                standing = player_standing(2025, score.player_id)
+            self.assertEqual(
+                (standing.rank, standing.points), (score.rank, score.points)
+            )
+
+        Player.objects.create(name="Unvoted")
+        self.assertIsNone(player_standing(2025, Player.objects.last().id))
+
+    def test_candidate_page_does_not_read_votes(self):
+        self.verify_votes([(1, 0, 2), (1, 2, 0)])
+        candidate = Candidate.objects.get(player=self.players[0])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("candidate_detail", args=[2025, candidate.slug])
+            )
+
+        self.assertEqual(response.context["voting_stats"]["current_rank"], 2)
+        self.assertEqual(response.context["voting_stats"]["total_points"], 4)
+        self.assertFalse(
+            any("ballon_dor_vote" in query["sql"] for query in queries.captured_queries)
+        )
+
+
+class ResultsCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_result_cached_until_version_bump(self):
+        self.assertEqual(cached_result(2025, "test", self.compute), 1)
+        self.assertEqual(cached_result(2025, "test", self.compute), 1)
+
+        version = get_results_version(2025)
+        bump_results_version(2025)
+        self.assertNotEqual(get_results_version(2025), version)
+        self.assertEqual(cached_result(2025, "test", self.compute), 2)
+
+    def test_stale_value_served_while_locked(self):
+        cached_result(2025, "test", self.compute)
+        bump_results_version(2025)
+
+        # Another worker holds the recompute lock for the new version
+        key = f"ballon_dor:test:2025:{get_results_version(2025)}"
+        cache.add(f"{key}:lock", True)
+
+        self.assertEqual(cached_result(2025, "test", self.compute), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_verifying_vote_refreshes_live_results(self):
+        players = [
+            Player.objects.create(name=name) for name in ("Messi", "Ronaldo", "Neymar")
+        ]
+        Vote.objects.create(
+            player_1st=players[0],
+            player_2nd=players[1],
+            player_3rd=players[2],
+            email="a@example.com",
+            year=2025,
+            token="token",
+        )
+        Candidate.objects.create(player=players[0], year=2025)
+
+        response = self.client.get(reverse("live_results"))
+        self.assertEqual(response.context["total_votes"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse("verify", args=["token"]))
+
+        response = self.client.get(reverse("live_results"))
+        self.assertEqual(response.context["total_votes"], 1)
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse("live_results"))
+
+
+class LiveResultsStreamTest(TransactionTestCase):
+    # Streams read on their own pool threads, whose connections only see
+    # committed rows
+    def setUp(self):
+        cache.clear()
+        self.player = Player.objects.create(name="Messi")
+        Candidate.objects.create(player=self.player, year=2025)
+        PlayerYearScore.objects.create(
+            player=self.player, year=2025, first_votes=1, points=5
+        )
+
+    def test_results_delta_only_sends_changed_rows(self):
+        # Views are imported inside the tests, so loading this module never
+        # depends on what importing the URLconf does
+        from .views.resultView import results_delta
+
+        previous = {
+            "rows": [[1, 1, "Messi", 8], [2, 2, "Ronaldo", 5]],
+            "total_votes": 2,
+        }
+        current = {
+            "rows": [[2, 1, "Ronaldo", 10], [1, 2, "Messi", 8]],
+            "total_votes": 3,
+        }
+
+        delta = results_delta(previous, current)
+
+        self.assertEqual(delta["changed"], [[2, 1, "Ronaldo", 10], [1, 2, "Messi", 8]])
+        self.assertEqual(delta["order"], [2, 1])
+        self.assertEqual(delta["removed"], [])
+        self.assertIsNone(results_delta(current, current))
+
+    async def test_stream_pushes_results_when_version_differs(self):
+        response = await self.async_client.get(
+            reverse("live_results_stream"), {"since": "outdated"}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        event = await anext(aiter(response.streaming_content))
+        data = json.loads(event.decode().split("data: ")[1])
+        self.assertEqual(data["order"], [self.player.id])
+        self.assertEqual(data["total_votes"], 1)
+
+    async def test_stream_resumes_from_last_event_id(self):
+        from .views.resultView import LiveResultsStreamView
+
+        version = await sync_to_async(get_results_version)(2025)
+        with patch.multiple(
+            LiveResultsStreamView, max_duration=0.05, poll_interval=0.01
+        ):
+            response = await self.async_client.get(
+                reverse("live_results_stream"),
+                {"since": "rendered-page-version"},
+                headers={"Last-Event-ID": str(version)},
+            )
+            events = [event async for event in response.streaming_content]
+
+        # Up to date as of the last event: no full snapshot is resent
+        self.assertEqual(events, [])
+
+    def test_open_streams_share_a_fixed_pool_of_threads(self):
+        from ballon_dor_project.asgi import application
+
+        from .views.resultView import STREAM_EXECUTOR, LiveResultsStreamView
+
+        version = get_results_version(2025)
+        get_active_year()
+        starts = []
+
+        def receiver(disconnect):
+            requested = False
+
+            async def receive():
+                nonlocal requested
+                if not requested:
+                    requested = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await disconnect.wait()
+                return {"type": "http.disconnect"}
+
+            return receive
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                starts.append(message["status"])
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": reverse("live_results_stream"),
+            "query_string": b"",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"last-event-id", str(version).encode()),
+            ],
+        }
+
+        async def open_streams(count):
+            disconnect = asyncio.Event()
+            streams = [
+                asyncio.ensure_future(
+                    application(dict(scope), receiver(disconnect), send)
+                )
+                for _ in range(count)
+            ]
+            await asyncio.sleep(0.2)
+            threads = threading.active_count()
+            disconnect.set()
+            await asyncio.wait_for(asyncio.gather(*streams), timeout=5)
+            return threads
+
+        # Run outside async_to_sync, as a server would: under it, asgiref
+        # sends thread-sensitive work to the calling thread instead
+        threads_before = threading.active_count()
+        with patch.object(LiveResultsStreamView, "poll_interval", 0.01):
+            threads_during = asyncio.run(open_streams(30))
+
+        self.assertLessEqual(
+            threads_during - threads_before, STREAM_EXECUTOR._max_workers
+        )
+        self.assertEqual(starts, [200] * 30)
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.players = [
+            Player.objects.create(name=name) for name in ("Messi", "Ronaldo", "Neymar")
+        ]
+        self.candidate = Candidate.objects.create(player=self.players[0], year=2025)
+        Vote.objects.create(
+            player_1st=self.players[0],
+            player_2nd=self.players[1],
+            player_3rd=self.players[2],
+            email="a@example.com",
+            year=2025,
+            token="token",
+        )
+
+    def urls(self):
+        return [
+            reverse("home"),
+            reverse("live_results"),
+            reverse("candidate_detail", args=[2025, self.candidate.slug]),
+        ]
+
+    def test_unchanged_tally_returns_304(self):
+        for url in self.urls():
+            etag = self.client.get(url)["ETag"]
+
+            with self.assertNumQueries(0):
+                response = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b"")
+
+    def test_verifying_vote_changes_etag(self):
+        etags = [self.client.get(url)["ETag"] for url in self.urls()]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse("verify", args=["token"]))
+
+        for url, etag in zip(self.urls(), etags):
+            response = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response["ETag"], etag)
+
+    def test_editing_candidate_changes_etag(self):
+        url = reverse("home")
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.candidate.goals = 30
+            self.candidate.save()
+
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_deadline_change_and_closing_change_etag(self):
+        urls = self.urls() + [reverse("history")]
+        etags = [self.client.get(url)["ETag"] for url in urls]
+
+        # The navbar's "Voting ends" date comes from the election
+        with self.captureOnCommitCallbacks(execute=True):
+            election = Election.objects.create(
+                year=2025, closes_at=timezone.now() + timedelta(days=2)
+            )
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 200, url)
+
+        # Passing the deadline changes the page without any save
+        etags = [self.client.get(url)["ETag"] for url in urls]
+        with patch(
+            "django.utils.timezone.now", return_value=election.closes_at + timedelta(1)
+        ):
+            for url, etag in zip(urls, etags):
+                response = self.client.get(url, headers={"If-None-Match": etag})
+                self.assertEqual(response.status_code, 200, url)
+
+
+class OutboxTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.players = [
+            Player.objects.create(name=name) for name in ("Messi", "Ronaldo", "Neymar")
+        ]
+        # A future year keeps voting open
+        for player in self.players:
+            Candidate.objects.create(player=player, year=2099)
+
+    def post_vote(self, email="fan@example.com"):
+        return self.client.post(
+            reverse("vote"),
+            {
+                "player_1st": self.players[0].id,
+                "player_2nd": self.players[1].id,
+                "player_3rd": self.players[2].id,
+                "email": email,
+            },
+        )
+
+    def test_vote_queues_email_without_sending(self):
+        response = self.post_vote()
+
+        self.assertRedirects(response, reverse("vote_pending"))
+        self.assertEqual(len(mail.outbox), 0)
+        queued = OutboxEmail.objects.get()
+        self.assertEqual(queued.to, "fan@example.com")
+        self.assertIn(Vote.objects.get().token, queued.html_body)
+
+    def test_send_outbox_delivers_queued_emails(self):
+        self.post_vote("a@example.com")
+        self.post_vote("b@example.com")
+
+        call_command("send_outbox", stdout=StringIO())
+
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox), ["a@example.com", "b@example.com"]
+        )
+        self.assertFalse(OutboxEmail.objects.exclude(status=OutboxEmail.SENT).exists())
+
+    def test_failed_send_is_retried_later(self):
+        self.post_vote()
+
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=ConnectionError("mail server down"),
+        ):
+            self.assertEqual(send_batch(), (0, 1))
+
+        queued = OutboxEmail.objects.get()
+        self.assertEqual(queued.status, OutboxEmail.PENDING)
+        self.assertEqual(queued.attempts, 1)
+        self.assertGreater(queued.next_attempt_at, timezone.now())
+        self.assertEqual(send_batch(), (0, 0))  # not due yet
+
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(send_batch(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class ElectionConfigTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.player = Player.objects.create(name="Messi")
+        Candidate.objects.create(player=self.player, year=2025)
+
+    def test_active_year_is_memoized(self):
+        self.assertEqual(get_active_year(), 2025)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_active_year(), 2025)
+            get_voting_deadline(2025)
+
+    def test_candidate_signals_invalidate(self):
+        self.assertEqual(get_active_year(), 2025)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            candidate = Candidate.objects.create(player=self.player, year=2026)
+        self.assertEqual(get_active_year(), 2026)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            candidate.delete()
+        self.assertEqual(get_active_year(), 2025)
+
+    def test_version_bump_from_another_worker_reloads(self):
+        self.assertEqual(get_active_year(), 2025)
+        # Simulate a write in another process: no local signal, only the version
+        Candidate.objects.bulk_create([Candidate(player=self.player, year=2030)])
+        self.assertEqual(get_active_year(), 2025)
+
+        bump_election_version()
+        self.assertEqual(get_active_year(), 2030)
+
+    def test_snapshot_expires_without_version_bump(self):
+        # A per-process cache never sees another worker's bump
+        self.assertEqual(get_active_year(), 2025)
+        Candidate.objects.bulk_create([Candidate(player=self.player, year=2030)])
+        clock = time.monotonic() + SNAPSHOT_TTL
+        with patch("ballon_dor.utils.time.monotonic", return_value=clock):
+            self.assertEqual(get_active_year(), 2030)
+
+    def test_search_index_expires_without_version_bump(self):
+        clear_search_indexes()
+        self.assertEqual(get_search_index(2025).search("messi")[0].name, "Messi")
+        Player.objects.filter(pk=self.player.pk).update(name="Lionel")
+        self.assertTrue(get_search_index(2025).search("messi"))
+        clock = time.monotonic() + SNAPSHOT_TTL
+        with patch("ballon_dor.search.time.monotonic", return_value=clock):
+            self.assertEqual(get_search_index(2025).search("messi"), [])
+
+
+class StartupTest(SimpleTestCase):
+    def test_urlconf_imports_without_database(self):
+        # A database that can't be opened: any query at import time would fail
+        env = dict(
+            os.environ,
+            DATABASE_URL="sqlite:////nonexistent/dir/db.sqlite3",
+            DJANGO_SETTINGS_MODULE="ballon_dor_project.settings",
+        )
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import django; django.setup(); "
+                "from django.urls import get_resolver; get_resolver().url_patterns",
+            ],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=settings.BASE_DIR,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_asgi_disables_persistent_connections(self):
+        env = dict(os.environ, DATABASE_URL="sqlite:////tmp/db.sqlite3")
+        env.pop("DB_CONN_MAX_AGE", None)
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import ballon_dor_project.asgi; from django.db import connection; "
+                "print(connection.settings_dict['CONN_MAX_AGE'])",
+            ],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=settings.BASE_DIR,
+        )
+        self.assertEqual(result.stdout.strip(), "0", result.stderr)
+
+    def test_startup_bench_reports_timings(self):
+        out = StringIO()
+        call_command("startup_bench", "--path", "", "--top", "3", stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertIn("time_to_first_request_ms", report)
+        self.assertEqual(len(report["slowest_imports"]), 3)
+
+
+class BenchCommandTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+
+    def test_bench_reports_every_view(self):
+        out = StringIO()
+        call_command(
+            "bench",
+            "--use-current-db",
+            "--players=10",
+            "--candidates=5",
+            "--votes=50",
+            "--requests=2",
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(
+            set(report["views"]),
+            {"home", "live_results", "candidate_detail", "vote_post", "verify"},
+        )
+        for stats in report["views"].values():
+            self.assertEqual(set(stats["latency_ms"]), {"p50", "p95", "p99"})
+            self.assertTrue(all(code < 400 for code in stats["status_codes"]))
+        self.assertEqual(Vote.objects.filter(is_verified=True).count(), 50 + 3)
+
+    def test_bench_generates_enough_pending_votes(self):
+        out = StringIO()
+        call_command(
+            "bench",
+            "--use-current-db",
+            "--players=10",
+            "--candidates=5",
+            "--votes=10",
+            "--requests=4",
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["views"]["verify"]["status_codes"], [302])
+
+
+@override_settings(PERF_INSTRUMENTATION=True)
+class QueryTimingMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        performance_log.clear()
+        Candidate.objects.create(player=Player.objects.create(name="Messi"), year=2025)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("live_results"))
+
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertRegex(timing, r"render;dur=[\d.]+")
+        self.assertRegex(timing, r"total;dur=[\d.]+")
+
+    def test_summary_is_staff_only(self):
+        self.client.get(reverse("live_results"))
+        self.client.get(reverse("live_results"))
+
+        response = self.client.get(reverse("performance"))
+        self.assertEqual(response.status_code, 302)
+
+        staff = get_user_model().objects.create_user(
+            "staff", password="pw", is_staff=True
+        )
+        self.client.force_login(staff)
+        summary = self.client.get(reverse("performance")).json()
+
+        live_results = summary["views"]["live_results"]
+        self.assertEqual(live_results["requests"], 2)
+        self.assertEqual(set(live_results["total_ms"]), {"p50", "p95", "p99"})
+        self.assertTrue(live_results["slowest_queries"])
+
+    @override_settings(PERF_INSTRUMENTATION=False)
+    def test_disabled_by_default(self):
+        response = self.client.get(reverse("live_results"))
+        self.assertNotIn("Server-Timing", response)
+
+
+class VoteExportTest(TestCase):
+    def setUp(self):
+        a, b, c = (Player.objects.create(name=name) for name in ("A", "B", "C"))
+        for i, verified in enumerate([True, True, False]):
+            Vote.objects.create(
+                player_1st=a,
+                player_2nd=b,
+                player_3rd=c,
+                email=f"v{i}@example.com",
+                voter_country="FR",
+                year=2025,
+                is_verified=verified,
+                token="" if verified else "secret-token",
+            )
+        Vote.objects.create(
+            player_1st=a, player_2nd=b, player_3rd=c, email="old@example.com", year=2024
+        )
+        self.url = reverse("vote_export", args=[2025])
+        self.client.force_login(
+            get_user_model().objects.create_user("staff", password="pw", is_staff=True)
+        )
+
+    def test_csv_streams_flat_rows(self):
+        response = self.client.get(self.url)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            rows[0].split(",")[:5],
+            ["id", "year", "player_1st_id", "player_2nd_id", "player_3rd_id"],
+        )
+        self.assertEqual(len(rows), 4)
+        self.assertNotIn("secret-token", "".join(rows))
+
+    def test_ndjson_gzip_verified_only(self):
+        response = self.client.get(
+            self.url, {"format": "ndjson", "gzip": "1", "verified": "1"}
+        )
+
+        self.assertIn("votes-2025.ndjson.gz", response["Content-Disposition"])
+        lines = gzip.decompress(b"".join(response.streaming_content)).splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(len(records), 2)
+        self.assertTrue(all(r["is_verified"] and r["year"] == 2025 for r in records))
+
+    async def test_asgi_streams_chunk_by_chunk(self):
+        user = await get_user_model().objects.aget(username="staff")
+        await self.async_client.aforce_login(user)
+        with patch("ballon_dor.exports.BUFFER_SIZE", 1):
+            response = await self.async_client.get(self.url)
+
+            # An async iterator: Django won't list() it before sending
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual(len(b"".join(chunks).decode().splitlines()), 4)
+
+    def test_staff_only_and_bad_format(self):
+        self.assertEqual(self.client.get(self.url, {"format": "xml"}).status_code, 400)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "votes.ndjson")
+            call_command(
+                "export_votes",
+                path,
+                "--year=2025",
+                "--format=ndjson",
+                stdout=StringIO(),
+            )
+            with open(path) as f:
+                self.assertEqual(len(f.readlines()), 3)
+
+
+class CatalogImportTest(TestCase):
+    def records(self, messi_name="Lionel Messi"):
+        return [
+            {"model": "ballon_dor.player", "pk": 1, "fields": {"name": messi_name}},
+            {"model": "ballon_dor.player", "pk": 2, "fields": {"name": "Lionel Messi"}},
+            {"model": "ballon_dor.club", "pk": 1, "fields": {"name": "Barcelona"}},
+            {
+                "model": "ballon_dor.nationalteam",
+                "pk": 1,
+                "fields": {"name": "Argentina"},
+            },
+            {
+                "model": "ballon_dor.candidate",
+                "pk": 1,
+                "fields": {"player": 1, "year": 2025, "club": 1, "slug": ""},
+            },
+            {
+                "model": "ballon_dor.candidate",
+                "pk": 2,
+                "fields": {"player": 2, "year": 2025, "club": None, "slug": ""},
+            },
+            {
+                "model": "ballon_dor.ballondorresult",
+                "pk": 1,
+                "fields": {
+                    "year": 2009,
+                    "rank": "1",
+                    "player": 1,
+                    "club_at_award": 1,
+                    "nationality_at_award": 1,
+                    "points": 473,
+                },
+            },
+            {"model": "ballon_dor.vote", "pk": 1, "fields": {}},
+        ]
+
+    def test_import_assigns_unique_slugs_in_bulk(self):
+        # Savepoint, existing slugs, one INSERT per model, release
+        with self.assertNumQueries(8):
+            counts, skipped = import_catalog(self.records())
+
+        self.assertEqual(counts["ballon_dor.candidate"], 2)
+        self.assertEqual(skipped, 1)
+        self.assertEqual(
+            sorted(Candidate.objects.values_list("slug", flat=True)),
+            ["lionel-messi", "lionel-messi-1"],
+        )
+        self.assertEqual(BallonDorResult.objects.get().points, 473)
+
+    def test_reimport_is_an_upsert(self):
+        import_catalog(self.records())
+        import_catalog(self.records(messi_name="Leo Messi"))
+
+        self.assertEqual(Player.objects.count(), 2)
+        self.assertEqual(Player.objects.get(pk=1).name, "Leo Messi")
+        self.assertEqual(Candidate.objects.count(), 2)
+
+    def test_missing_reference_is_rejected(self):
+        records = [
+            {
+                "model": "ballon_dor.candidate",
+                "pk": 1,
+                "fields": {"player": 99, "year": 2025},
+            }
+        ]
+        with self.assertRaisesMessage(
+            CatalogImportError, "ballon_dor.player ids: [99]"
+        ):
+            import_catalog(records)
+        self.assertFalse(Candidate.objects.exists())
+
+    def test_command_loads_historical_dataset(self):
+        path = os.path.join(settings.BASE_DIR, "data", "ballo_dor.json")
+        out = StringIO()
+        call_command("import_history", path, stdout=out)
+
+        self.assertIn("ballon_dor.ballondorresult: 202", out.getvalue())
+        self.assertEqual(Candidate.objects.filter(year=2025).count(), 35)
+
+
+class AdminChangelistTest(TestCase):
+    def setUp(self):
+        self.client.force_login(
+            get_user_model().objects.create_superuser("admin", password="pw")
+        )
+        self.players = [Player.objects.create(name=f"P{i}") for i in range(3)]
+        Candidate.objects.create(player=self.players[0], year=2025)
+
+    def add_votes(self, count):
+        a, b, c = self.players
+        Vote.objects.bulk_create(
+            Vote(
+                player_1st=a,
+                player_2nd=b,
+                player_3rd=c,
+                email=f"v{Vote.objects.count()}-{i}@example.com",
+                year=2025,
+                is_verified=True,
+            )
+            for i in range(count)
+        )
+
+    def changelist_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return [q["sql"] for q in captured.captured_queries]
+
+    def test_vote_changelist_query_count_is_flat(self):
+        url = reverse("admin:ballon_dor_vote_changelist")
+        self.add_votes(2)
+        self.changelist_queries(url)  # load the per-process election snapshot
+        few = self.changelist_queries(url)
+        self.add_votes(40)
+        many = self.changelist_queries(url)
+
+        self.assertEqual(len(few), len(many))
+
+    def test_filtered_changelist_skips_full_count(self):
+        self.add_votes(3)
+        queries = self.changelist_queries(
+            reverse("admin:ballon_dor_vote_changelist"),
+            {"year": 2025, "is_verified__exact": 1},
+        )
+
+        counts = [sql for sql in queries if "COUNT(" in sql]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('"year" = 2025', counts[0])
+
+    def test_candidate_changelist(self):
+        url = reverse("admin:ballon_dor_candidate_changelist")
+        self.assertContains(self.client.get(url), "P0")
+
+
+class HomeFacetsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        barca = Club.objects.create(name="Barcelona")
+        self.psg = Club.objects.create(name="PSG")
+        for name, country, club in [
+            ("Yamal", "Spain", barca),
+            ("Pedri", "Spain", barca),
+            ("Dembele", "France", self.psg),
+            ("Hakimi", "Morocco", self.psg),
+            ("Free Agent", "", None),
+        ]:
+            player = Player.objects.create(name=name, country=country)
+            Candidate.objects.create(player=player, year=2099, club=club)
+
+    def test_facets_come_from_one_grouped_query(self):
+        with self.assertNumQueries(1):
+            facets = get_facets(2099)
+        with self.assertNumQueries(0):
+            get_facets(2099)
+
+        self.assertEqual(facets.clubs, [("Barcelona", 2), ("PSG", 2)])
+        self.assertEqual(
+            facets.countries, [("France", 1), ("Morocco", 1), ("Spain", 2)]
+        )
+
+    def test_page_counts_come_from_facets(self):
+        url = reverse("home")
+        self.client.get(url)  # warm the caches
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, {"club": "PSG", "country": "France"})
+        self.assertEqual(response.context["results_count"], 1)
+        self.assertFalse(any("COUNT(" in q["sql"] for q in captured.captured_queries))
+        self.assertContains(response, "Barcelona (2)")
+
+        response = self.client.get(url, {"search": "ped", "club": "Barcelona"})
+        self.assertEqual(response.context["results_count"], 1)
+
+    def test_club_rename_invalidates_facets(self):
+        get_facets(2099)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.psg.name = "Paris SG"
+            self.psg.save()
+
+        self.assertIn(("Paris SG", 2), get_facets(2099).clubs)
+
+
+class CandidateSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_search_indexes()
+        psg = Club.objects.create(name="PSG")
+        for name in ("Désiré Doué", "Ousmane Dembélé", "Lamine Yamal", "Kylian Mbappé"):
+            Candidate.objects.create(
+                player=Player.objects.create(name=name), year=2099, club=psg
+            )
+
+    def names(self, query):
+        return [entry.name for entry in SearchIndex.build(2099).search(query)]
+
+    def test_fold_strips_accents_and_punctuation(self):
+        self.assertEqual(fold("N'Golo Kanté"), "n golo kante")
+
+    def test_accent_prefix_and_typo_matching(self):
+        self.assertEqual(self.names("desire doue"), ["Désiré Doué"])
+        self.assertEqual(self.names("dem"), ["Ousmane Dembélé"])
+        self.assertEqual(self.names("ousmnae"), ["Ousmane Dembélé"])
+        self.assertEqual(self.names("mbape"), ["Kylian Mbappé"])
+        self.assertEqual(self.names("xyz"), [])
+
+    def test_home_search_uses_index(self):
+        response = self.client.get(reverse("home"), {"search": "doue"})
+        self.assertEqual(
+            [c.player.name for c in response.context["page_obj"]], ["Désiré Doué"]
+        )
+
+    def test_autocomplete_needs_no_query_once_warm(self):
+        url = reverse("candidate_autocomplete")
+        self.client.get(url, {"q": "y"})
+
+        with self.assertNumQueries(0):
+            results = self.client.get(url, {"q": "yam"}).json()["results"]
+        self.assertEqual(results[0]["name"], "Lamine Yamal")
+        self.assertEqual(results[0]["club"], "PSG")
+
+    def test_index_rebuilds_when_candidates_change(self):
+        url = reverse("candidate_autocomplete")
+        self.assertEqual(self.client.get(url, {"q": "vitinha"}).json()["results"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Candidate.objects.create(
+                player=Player.objects.create(name="Vitinha"), year=2099
+            )
+
+        results = self.client.get(url, {"q": "vitinha"}).json()["results"]
+        self.assertEqual(len(results), 1)
+
+
+class KeysetPaginationTest(TestCase):
+    ordering = (("player__name", False), ("id", False))
+
+    def setUp(self):
+        cache.clear()
+        # Duplicate names make the id tie-breaker matter
+        for i in range(7):
+            player = Player.objects.create(name=f"Player {i // 2}", country="FR")
+            Candidate.objects.create(player=player, year=2099, slug=f"p{i}")
+        self.queryset = Candidate.objects.select_related("player")
+
+    def test_walk_forward_and_back(self):
+        expected = list(self.queryset.order_by("player__name", "id"))
+
+        pages = [keyset_page(self.queryset, self.ordering, per_page=3)]
+        while pages[-1].has_next:
+            pages.append(
+                keyset_page(self.queryset, self.ordering, pages[-1].next_cursor, 3)
+            )
+        self.assertEqual([c for page in pages for c in page], expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertFalse(pages[0].has_previous)
+
+        back = keyset_page(self.queryset, self.ordering, pages[2].previous_cursor, 3)
+        self.assertEqual(back.object_list, pages[1].object_list)
+        self.assertTrue(back.has_previous)
+
+    def test_bad_cursor_falls_back_to_first_page(self):
+        self.assertEqual(decode_cursor("not a cursor!"), (None, False))
+        wrong_shape = encode_cursor(["Player 1"])
+        page = keyset_page(self.queryset, self.ordering, wrong_shape, 3)
+        self.assertFalse(page.has_previous)
+
+        # Tampered values fall back too instead of erroring in the query
+        for values in (["a", "x"], ["a", None]):
+            page = keyset_page(self.queryset, self.ordering, encode_cursor(values), 3)
+            self.assertFalse(page.has_previous)
+            self.assertEqual(len(page), 3)
+        response = self.client.get(
+            reverse("history"), {"cursor": encode_cursor(["abc", "1"])}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_home_pages_keep_filters_and_skip_count(self):
+        for i in range(7, 20):
+            player = Player.objects.create(name=f"Player {i}", country="FR")
+            Candidate.objects.create(player=player, year=2099, slug=f"p{i}")
+        url = reverse("home")
+
+        first = self.client.get(url, {"country": "FR"})
+        self.assertEqual(first.context["results_count"], 20)
+        self.assertContains(first, "country=FR&amp;cursor=")
+
+        cursor = first.context["page_obj"].next_cursor
+        with CaptureQueriesContext(connection) as captured:
+            second = self.client.get(url, {"country": "FR", "cursor": cursor})
+        self.assertFalse(any("COUNT(" in q["sql"] for q in captured.captured_queries))
+        self.assertEqual(len(second.context["page_obj"]), 5)
+        self.assertFalse(second.context["page_obj"].has_next)
+
+
+class HistoryViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        club = Club.objects.create(name="Barcelona")
+        team = NationalTeam.objects.create(name="Argentina")
+        for year in range(1990, 2010):
+            for rank in "123":
+                BallonDorResult.objects.create(
+                    year=year,
+                    rank=rank,
+                    player=Player.objects.create(name=f"P{year}-{rank}"),
+                    club_at_award=club,
+                    nationality_at_award=team,
+                    points=100 - int(rank),
+                )
+
+    def test_history_is_paged_newest_first(self):
+        response = self.client.get(reverse("history"))
+        results = response.context["results"]
+        self.assertEqual(len(results), 30)
+        self.assertEqual((results[0].year, results[0].rank), (2009, "1"))
+
+        cursor = response.context["page_obj"].next_cursor
+        with self.assertNumQueries(1):
+            older = self.client.get(reverse("history"), {"cursor": cursor})
+        self.assertEqual(
+            [(r.year, r.rank) for r in older.context["results"]][:2],
+            [(1999, "1"), (1999, "2")],
+        )
+        self.assertFalse(older.context["page_obj"].has_next)
+
+
+class FinalResultTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        club = Club.objects.create(name="Barcelona")
+        self.players = [
+            Player.objects.create(name=name, country="Spain")
+            for name in ("Yamal", "Pedri", "Raphinha")
+        ]
+        for player in self.players:
+            Candidate.objects.create(player=player, year=2025, club=club)
+        a, b, c = self.players
+        for i, (picks, country) in enumerate(
+            [((a, b, c), "ES"), ((a, c, b), "FR"), ((b, a, c), "ES")]
+        ):
+            Vote.objects.create(
+                player_1st=picks[0],
+                player_2nd=picks[1],
+                player_3rd=picks[2],
+                email=f"fan{i}@example.com",
+                voter_country=country,
+                year=2025,
+                is_verified=True,
+            )
+        rebuild_scores(2025)
+
+    def test_finalize_freezes_winner_and_totals(self):
+        result = finalize_results(2025)
+
+        self.assertEqual(result.winner.player, self.players[0])
+        self.assertEqual(
+            (result.points, result.first_place_votes, result.total_votes),
+            (13, 2, 3),
+        )
+        self.assertEqual(result.countries, 2)
+
+        finalize_results(2025)
+        self.assertEqual(FinalResult.objects.count(), 1)
+
+    def test_closed_home_page_before_finalizing_writes_nothing(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.assertContains(self.client.get(reverse("home")), "Yamal")
+        self.assertFalse(FinalResult.objects.exists())
+        self.assertFalse(
+            any(
+                query["sql"].startswith(("INSERT", "UPDATE"))
+                for query in captured.captured_queries
+            )
+        )
+
+    def test_closed_home_page_reads_one_row(self):
+        url = reverse("home")
+        finalize_results(2025)
+        self.assertContains(self.client.get(url), "Yamal")
+
+        cache.clear()  # bypass the ETag and facet caches
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        sql = [q["sql"] for q in captured.captured_queries]
+        self.assertFalse(any("ballon_dor_vote" in query for query in sql))
+        self.assertFalse(any("ballon_dor_playeryearscore" in query for query in sql))
+        self.assertEqual(response.context["final_result"].points, 13)
+
+    def test_command_refuses_open_election(self):
+        Candidate.objects.create(player=self.players[0], year=2099)
+        with self.assertRaisesMessage(CommandError, "still open"):
+            call_command("finalize_results", "--year=2099", stdout=StringIO())
+
+        out = StringIO()
+        call_command("finalize_results", "--year=2025", stdout=out)
+        self.assertIn(
+            "2025: Yamal, 13 points, 3 votes from 2 countries", out.getvalue()
+        )
+
+
+class VoteFormChoicesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.players = [
+            Player.objects.create(name=name) for name in ("Yamal", "Pedri", "Vitinha")
+        ]
+        for player in self.players:
+            Candidate.objects.create(player=player, year=2099)
+        self.outsider = Player.objects.create(name="Retired")
+
+    def data(self, *players):
+        return {
+            "player_1st": players[0].id,
+            "player_2nd": players[1].id,
+            "player_3rd": players[2].id,
+            "email": "fan@example.com",
+        }
+
+    def test_choices_are_cached_and_shared(self):
+        with self.assertNumQueries(1):
+            form = VoteForm(year=2099)
+            html = str(form["player_1st"]) + str(form["player_3rd"])
+        self.assertIn("Vitinha", html)
+
+        with self.assertNumQueries(0):
+            VoteForm(year=2099).as_p()
+        self.assertEqual(
+            candidate_choices(2099),
+            tuple((p.id, p.name) for p in sorted(self.players, key=lambda p: p.name)),
+        )
+
+    def test_validation_needs_no_queries(self):
+        candidate_choices(2099)
+        with self.assertNumQueries(0):
+            form = VoteForm(data=self.data(*self.players), year=2099)
+            self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data["player_1st"].name, "Yamal")
+
+        form = VoteForm(data=self.data(self.outsider, *self.players[1:]), year=2099)
+        self.assertFalse(form.is_valid())
+        self.assertIn("player_1st", form.errors)
+
+    def test_vote_post_saves_picks(self):
+        self.client.post(reverse("vote"), self.data(*self.players))
+
+        vote = Vote.objects.get()
+        self.assertEqual(
+            [vote.player_1st_id, vote.player_2nd_id, vote.player_3rd_id],
+            [p.id for p in self.players],
+        )
+
+    def test_new_candidate_appears_in_choices(self):
+        candidate_choices(2099)
+        with self.captureOnCommitCallbacks(execute=True):
+            Candidate.objects.create(player=self.outsider, year=2099)
+        self.assertIn((self.outsider.id, "Retired"), candidate_choices(2099))
+
+
+class SubmitVoteTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.players = [
+            Player.objects.create(name=name) for name in ("Yamal", "Pedri", "Vitinha")
+        ]
+        for player in self.players:
+            Candidate.objects.create(player=player, year=2099)
+
+    def vote(self, order=(0, 1, 2), token="t1", email="fan@example.com"):
+        a, b, c = (self.players[i] for i in order)
+        return Vote(
+            player_1st=a,
+            player_2nd=b,
+            player_3rd=c,
+            email=email,
+            year=2099,
+            token=token,
+        )
+
+    def check_upsert(self):
+        first = self.vote()
+        self.assertTrue(submit_vote(first))
+
+        again = self.vote(order=(2, 1, 0), token="t2")
+        self.assertTrue(submit_vote(again))
+        self.assertEqual(again.pk, first.pk)
+        stored = Vote.objects.get()
+        self.assertEqual((stored.token, stored.player_1st), ("t2", self.players[2]))
+
+        Vote.objects.update(is_verified=True)
+        self.assertFalse(submit_vote(self.vote(token="t3")))
+        self.assertEqual(Vote.objects.get().player_1st, self.players[2])
+
+    def test_upsert_is_one_statement(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(submit_vote(self.vote()))
+
+    def test_upsert_replaces_pending_and_refuses_verified(self):
+        self.check_upsert()
+
+    def test_fallback_without_returning(self):
+        with patch.object(connection.features, "can_return_columns_from_insert", False):
+            self.check_upsert()
+
+    def test_vote_post_redirects_verified_email(self):
+        data = {
+            "player_1st": self.players[0].id,
+            "player_2nd": self.players[1].id,
+            "player_3rd": self.players[2].id,
+            "email": "fan@example.com",
+        }
+        self.assertRedirects(
+            self.client.post(reverse("vote"), data), reverse("vote_pending")
+        )
+        self.client.post(reverse("vote"), data)
+        self.assertEqual(Vote.objects.count(), 1)
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+
+        Vote.objects.update(is_verified=True)
+        self.assertRedirects(
+            self.client.post(reverse("vote"), data),
+            reverse("already_voted"),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+
+
+@override_settings(
+    RATE_LIMITS={"vote_ip": (2, 60), "vote_domain": (3, 60), "verify_ip": (2, 60)}
+)
+class RateLimitTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+
+    def post_vote(self, email="fan@example.com", ip="10.0.0.1"):
+        return self.client.post(reverse("vote"), {"email": email}, REMOTE_ADDR=ip)
+
+    def test_vote_ip_bucket_rejects_before_any_query(self):
+        self.post_vote()
+        self.post_vote()
+
+        with self.assertNumQueries(0):
+            response = self.post_vote()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "1")
+
+        # Other clients have their own bucket
+        self.assertNotEqual(self.post_vote(ip="10.0.0.2").status_code, 429)
+
+    def test_email_domain_bucket_spans_ips(self):
+        for i in range(3):
+            self.post_vote(email=f"bot{i}@junk.example", ip=f"10.0.1.{i}")
+        response = self.post_vote(email="bot9@JUNK.example", ip="10.0.1.9")
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(RATE_LIMIT_BEHIND_PROXY=True)
+    def test_proxied_clients_get_their_own_bucket(self):
+        # Every request arrives from the router's address
+        def post(client, forwarded):
+            return self.client.post(
+                reverse("vote"),
+                {"email": f"fan@{client}.example"},
+                REMOTE_ADDR="10.9.9.9",
+                HTTP_X_FORWARDED_FOR=forwarded,
+            )
+
+        for i in range(5):
+            response = post(f"fan{i}", f"198.51.100.{i}")
+            self.assertNotEqual(response.status_code, 429)
+        # A spoofed first hop doesn't buy a new bucket
+        post("x", "1.1.1.1, 203.0.113.7")
+        post("y", "2.2.2.2, 203.0.113.7")
+        self.assertEqual(post("z", "3.3.3.3, 203.0.113.7").status_code, 429)
+
+    def test_railway_trusts_forwarded_for_by_default(self):
+        env = dict(os.environ, RAILWAY_ENVIRONMENT="production")
+        env.pop("RATE_LIMIT_BEHIND_PROXY", None)
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import django; django.setup(); from django.conf import settings; "
+                "print(settings.RATE_LIMIT_BEHIND_PROXY)",
+            ],
+            capture_output=True,
+            text=True,
+            env=dict(env, DJANGO_SETTINGS_MODULE="ballon_dor_project.settings"),
+            cwd=settings.BASE_DIR,
+        )
+        self.assertEqual(result.stdout.strip(), "True", result.stderr)
+
+    def test_webmail_domains_only_limited_per_ip(self):
+        for i in range(6):
+            response = self.post_vote(email=f"fan{i}@Gmail.com", ip=f"10.0.2.{i}")
+            self.assertNotEqual(response.status_code, 429)
+
+    def test_buckets_refill(self):
+        rules = [("vote_ip", ratelimit.client_ip)]
+        request = RequestFactory().post("/vote/")
+        self.assertEqual(ratelimit.check(request, rules, now=100), 0)
+        self.assertEqual(ratelimit.check(request, rules, now=100), 0)
+        self.assertEqual(ratelimit.check(request, rules, now=100), 1)
+        self.assertEqual(ratelimit.check(request, rules, now=101), 0)
+
+    def test_verify_is_limited_on_get(self):
+        url = reverse("verify", args=["guess"])
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(self.client.get(url).status_code, 429)
+
+    @override_settings(RATE_LIMIT_BACKEND="cache")
+    def test_cache_backend(self):
+        self.post_vote()
+        self.post_vote()
+        self.assertEqual(self.post_vote().status_code, 429)
+        cache.clear()
+        self.assertNotEqual(self.post_vote().status_code, 429)
+
+    @override_settings(RATE_LIMIT_BACKEND="cache")
+    def test_cache_backend_uses_wall_clock(self):
+        rules = [("vote_ip", ratelimit.client_ip)]
+        request = RequestFactory().post("/vote/")
+        earlier = time.time() - 120
+        ratelimit.check(request, rules, now=earlier)
+        ratelimit.check(request, rules, now=earlier)
+        self.assertEqual(ratelimit.check(request, rules, now=earlier), 1)
+        # A host whose clock is behind the last writer refills nothing
+        self.assertEqual(ratelimit.check(request, rules, now=earlier - 10), 1)
+
+        # Another worker two minutes later sees a refilled bucket
+        self.assertEqual(ratelimit.check(request, rules), 0)
+
+    def test_memory_is_bounded(self):
+        buckets = ratelimit.MemoryBuckets(max_buckets=100)
+        for i in range(1000):
+            buckets.take(f"ip:{i}", 2, 1, now=i / 1000)
+        self.assertLessEqual(len(buckets.buckets), 100)
+        # The most recent clients keep their (partly spent) buckets
+        self.assertIn("ip:999", buckets.buckets)
+
+
+class ElectionModelTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.players = [
+            Player.objects.create(name=name) for name in ("Yamal", "Pedri", "Vitinha")
+        ]
+        for player in self.players:
+            Candidate.objects.create(player=player, year=2025)
+
+    def create_election(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Election.objects.create(year=2025, **kwargs)
+
+    def test_defaults_without_election_row(self):
+        rules = get_election(2025)
+        self.assertEqual(rules.closes_at, get_voting_deadline(2025))
+        self.assertEqual(rules.closes_at.month, 9)
+        self.assertEqual(rules.points, (5, 3, 1))
+
+    def test_election_sets_deadline_and_zero_query_checks(self):
+        closes_at = timezone.now() + timedelta(days=3)
+        self.create_election(closes_at=closes_at)
+
+        self.assertTrue(is_voting_open())
+        with self.assertNumQueries(0):
+            self.assertEqual(get_voting_deadline(2025), closes_at)
+            self.assertTrue(is_voting_open(2025))
+            self.client.get(reverse("voting_closed"))
+
+        response = self.client.get(reverse("vote"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["deadline"], closes_at)
+
+    def test_not_yet_open_and_admin_edit_refreshes(self):
+        election = self.create_election(
+            opens_at=timezone.now() + timedelta(days=1),
+            closes_at=timezone.now() + timedelta(days=3),
+        )
+        self.assertRedirects(
+            self.client.get(reverse("vote")),
+            reverse("voting_closed"),
+            fetch_redirect_response=False,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            election.opens_at = None
+            election.save()
+        self.assertTrue(is_voting_open(2025))
+
+    def test_home_before_opening_does_not_finalize(self):
+        election = self.create_election(
+            opens_at=timezone.now() + timedelta(days=1),
+            closes_at=timezone.now() + timedelta(days=3),
+        )
+        self.assertFalse(is_voting_open(2025))
+        self.assertFalse(is_voting_closed(2025))
+
+        response = self.client.get(reverse("home"))
+        self.assertFalse(response.context["voting_closed"])
+        self.assertIsNone(response.context["final_result"])
+        self.assertFalse(FinalResult.objects.exists())
+        self.assertFalse(Election.objects.get(year=2025).is_finalized)
+
+        # Open, vote, close: the real result is the one stored
+        with self.captureOnCommitCallbacks(execute=True):
+            election.opens_at = None
+            election.save()
+        a, b, c = self.players
+        Vote.objects.create(
+            player_1st=a,
+            player_2nd=b,
+            player_3rd=c,
+            email="fan@example.com",
+            year=2025,
+            token="tok",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            verify_vote("tok")
+            election.closes_at = timezone.now() - timedelta(minutes=1)
+            election.save()
+        self.assertTrue(is_voting_closed(2025))
+        call_command("finalize_results", stdout=StringIO())
+
+        result = self.client.get(reverse("home")).context["final_result"]
+        self.assertEqual(result.winner.player, a)
+        self.assertEqual(result.total_votes, 1)
+
+    def test_points_scheme_applies_to_tally(self):
+        self.create_election(
+            closes_at=timezone.now() + timedelta(days=3),
+            points_1st=10,
+            points_2nd=5,
+            points_3rd=2,
+        )
+        a, b, c = self.players
+        Vote.objects.create(
+            player_1st=a,
+            player_2nd=b,
+            player_3rd=c,
+            email="fan@example.com",
+            year=2025,
+            token="tok",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            verify_vote("tok")
+
+        points = dict(PlayerYearScore.objects.values_list("player__name", "points"))
+        self.assertEqual(points, {"Yamal": 10, "Pedri": 5, "Vitinha": 2})
+        self.assertEqual(score_mismatches(2025), [])
+
+    def test_points_change_rescores_counted_votes(self):
+        election = self.create_election(closes_at=timezone.now() + timedelta(days=3))
+        a, b, c = self.players
+        Vote.objects.create(
+            player_1st=a,
+            player_2nd=b,
+            player_3rd=c,
+            email="fan@example.com",
+            year=2025,
+            token="tok",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            verify_vote("tok")
+        version = get_results_version(2025)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            election.points_1st = 12
+            election.save()
+
+        points = dict(PlayerYearScore.objects.values_list("player__name", "points"))
+        self.assertEqual(points, {"Yamal": 12, "Pedri": 3, "Vitinha": 1})
+        self.assertEqual(score_mismatches(2025), [])
+        self.assertNotEqual(get_results_version(2025), version)
+
+        # Back to the default scheme without a row
+        with self.captureOnCommitCallbacks(execute=True):
+            election.delete()
+        self.assertEqual(PlayerYearScore.objects.get(year=2025, player=a).points, 5)
+        self.assertEqual(score_mismatches(2025), [])
+
+    def test_finalize_marks_election(self):
+        self.create_election(closes_at=timezone.now() - timedelta(days=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            finalize_results(2025)
+
+        self.assertTrue(Election.objects.get(year=2025).is_finalized)
+        self.assertTrue(get_election(2025).finalized)
+
+
+@override_settings(REPLICA_DATABASE="replica")
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_replica_only_inside_block(self):
+        self.assertIsNone(self.router.db_for_read(Vote))
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Vote), "replica")
+            # Sessions and users always come from the primary
+            self.assertIsNone(self.router.db_for_read(get_user_model()))
+            with primary_reads():
+                self.assertIsNone(self.router.db_for_read(Vote))
+            self.assertEqual(self.router.db_for_read(Vote), "replica")
+        self.assertIsNone(self.router.db_for_read(Vote))
+
+    def test_write_pins_later_reads_to_primary(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_write(Vote), "default")
+            self.assertIsNone(self.router.db_for_read(Vote))
+
+    def test_results_fill_from_replica_but_primary_readers_recompute(self):
+        def probe():
+            return cached_result(2025, "probe", lambda: router.db_for_read(Vote))
+
+        with replica_reads():
+            self.assertEqual(probe(), "replica")
+            self.assertEqual(probe(), "replica")
+        # A pinned voter doesn't trust a tally the replica may lag on
+        self.assertEqual(probe(), "default")
+        with replica_reads():
+            self.assertEqual(probe(), "default")
+
+    def test_catalog_fills_read_from_primary(self):
+        with replica_reads():
+            value = cached_catalog(2025, "probe", lambda: router.db_for_read(Vote))
+        self.assertEqual(value, "default")
+
+    def serve(self, view, method="get", **cookies):
+        """Run ``view`` through ReplicaMiddleware; the response names its database."""
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReplicaMiddleware(get_response)
+        request = getattr(self.factory, method)("/")
+        request.COOKIES.update(cookies)
+        return middleware(request).content.decode()
+
+    def test_middleware_routes_marked_get_requests(self):
+        marked = read_replica(lambda request: HttpResponse(router.db_for_read(Vote)))
+        unmarked = lambda request: HttpResponse(router.db_for_read(Vote))
+
+        self.assertEqual(self.serve(marked), "replica")
+        self.assertEqual(self.serve(marked, method="post"), "default")
+        self.assertEqual(self.serve(marked, **{PIN_COOKIE: "1"}), "default")
+        self.assertEqual(self.serve(unmarked), "default")
+        # Nothing leaks past the request
+        self.assertEqual(router.db_for_read(Vote), "default")
+
+        with override_settings(REPLICA_DATABASE=None):
+            self.assertEqual(self.serve(marked), "default")
+
+    def test_read_only_views_are_marked(self):
+        for name, args in [
+            ("home", []),
+            ("live_results", []),
+            ("history", []),
+            ("candidate_detail", [2025, "x"]),
+            ("vote_export", [2025]),
+        ]:
+            view = resolve(reverse(name, args=args)).func
+            self.assertTrue(getattr(view, "read_replica", False), name)
+        for name in ("vote", "verify"):
+            args = ["token"] if name == "verify" else []
+            view = resolve(reverse(name, args=args)).func
+            self.assertFalse(getattr(view, "read_replica", False), name)
+
+    def test_verify_pins_client_to_primary(self):
+        player = Player.objects.create(name="Yamal")
+        Vote.objects.create(
+            player_1st=player,
+            player_2nd=Player.objects.create(name="Pedri"),
+            player_3rd=Player.objects.create(name="Vitinha"),
+            email="fan@example.com",
+            year=2025,
+            token="tok",
+        )
+        response = self.client.get(reverse("verify", args=["tok"]))
+
+        self.assertRedirects(response, reverse("live_results"))
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], settings.REPLICA_PIN_SECONDS)
+        self.assertTrue(cookie["httponly"])
+
+
+# A second SQLite database for ReplicaDatabaseTest, created by the test
+# runner from the current models (a real replica gets its schema by
+# replication, not migrations). It stands in for a lagging replica: rows
+# created there only are invisible on the primary. Any configured replica
+# would only mirror ``default`` in tests.
+connections.settings["replica"] = {
+    **connections.settings["default"],
+    "ENGINE": "django.db.backends.sqlite3",
+    "NAME": ":memory:",
+    "OPTIONS": {},
+    "TEST": {
+        "CHARSET": None,
+        "COLLATION": None,
+        "MIGRATE": False,
+        "MIRROR": None,
+        "NAME": None,
+    },
+}
+
+
+@override_settings(REPLICA_DATABASE="replica")
+class ReplicaDatabaseTest(TestCase):
+    """Marked views really query a second database; pinned clients don't."""
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        player = Player.objects.using("replica").create(name="Yamal")
+        Candidate.objects.using("replica").create(
+            player=player, year=2025, slug="yamal"
+        )
+        self.url = reverse("candidate_detail", args=[2025, "yamal"])
+
+    def test_marked_get_reads_replica_until_pinned(self):
+        self.assertFalse(Candidate.objects.filter(slug="yamal").exists())
+
+        response = self.client.get(self.url)
+        self.assertContains(response, "Yamal")
+
+        self.client.cookies.update(pin_to_primary(HttpResponse()).cookies)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
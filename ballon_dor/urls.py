@@ -5,18 +5,27 @@ from . import views
 from .views import (
     HomePageView,
     LiveResultsView,
+    LiveResultsStreamView,
     VoteCreateView,
     AlreadyVotedView,
     VerifyView,
     VotePendingView,
     HistoryView,
     CandidateDetailView,
+    CandidateAutocompleteView,
+    PerformanceView,
+    VoteExportView,
 )
 
 urlpatterns = [
     path("", HomePageView.as_view(), name="home"),
     path("vote/", VoteCreateView.as_view(), name="vote"),
     path("live-results/", LiveResultsView.as_view(), name="live_results"),
+    path(
+        "live-results/stream/",
+        LiveResultsStreamView.as_view(),
+        name="live_results_stream",
+    ),
     path("already-voted/", AlreadyVotedView.as_view(), name="already_voted"),
     path("vote-pending/", VotePendingView.as_view(), name="vote_pending"),
     path("verify/<str:token>/", VerifyView.as_view(), name="verify"),
@@ -27,5 +36,16 @@ urlpatterns = [
         CandidateDetailView.as_view(),
         name="candidate_detail",
     ),
+    path(
+        "candidates/autocomplete/",
+        CandidateAutocompleteView.as_view(),
+        name="candidate_autocomplete",
+    ),
     path("voting-closed/", VotingClosedView.as_view(), name="voting_closed"),
+    path("staff/performance/", PerformanceView.as_view(), name="performance"),
+    path(
+        "staff/votes/<int:year>/export/",
+        VoteExportView.as_view(),
+        name="vote_export",
+    ),
 ]
@@ -1,14 +1,100 @@
+import time
+from collections import namedtuple
 from django.utils import timezone
 from datetime import datetime
-from .models import Candidate
+from .caching import SNAPSHOT_TTL, get_election_version
+from .models import Candidate, Election
+from .routers import primary_reads
 from django.db.models import Max
 import pytz
 
+# The active year and every Election's rules, memoized per process. Candidate
+# and Election signals clear it locally and bump the shared election version
+# so other workers reload it on their next call; it also expires after
+# SNAPSHOT_TTL seconds in case that bump never reaches this process.
+ElectionRules = namedtuple(
+    "ElectionRules", ["year", "opens_at", "closes_at", "points", "finalized"]
+)
+ElectionConfig = namedtuple(
+    "ElectionConfig", ["version", "year", "deadline", "elections", "expires"]
+)
 
-def get_active_year():
+_election_config = None
+
+
+def _load_election_config(version):
+    elections = {
+        election.year: ElectionRules(
+            election.year,
+            election.opens_at,
+            election.closes_at,
+            (election.points_1st, election.points_2nd, election.points_3rd),
+            election.is_finalized,
+        )
+        for election in Election.objects.all()
+    }
     max_year = Candidate.objects.aggregate(Max("year"))["year__max"]
-    return max_year if max_year else timezone.now().year
+    years = [y for y in (max_year, max(elections, default=None)) if y]
+    year = max(years) if years else timezone.now().year
+    rules = elections.get(year) or _default_rules(year)
+    return ElectionConfig(
+        version, year, rules.closes_at, elections, time.monotonic() + SNAPSHOT_TTL
+    )
 
 
-def get_voting_deadline(year):
+def get_election_config():
+    global _election_config
+    version = get_election_version()
+    config = _election_config
+    if (
+        config is None
+        or config.version != version
+        or time.monotonic() >= config.expires
+    ):
+        with primary_reads():
+            config = _load_election_config(version)
+        _election_config = config
+    return config
+
+
+def clear_election_config():
+    global _election_config
+    _election_config = None
+
+
+def get_active_year():
+    return get_election_config().year
+
+
+def _default_deadline(year):
     return datetime(year, 9, 21, 23, 59, 59, tzinfo=pytz.UTC)
+
+
+def _default_rules(year):
+    return ElectionRules(
+        year, None, _default_deadline(year), Election.DEFAULT_POINTS, False
+    )
+
+
+def get_election(year=None):
+    """The rules for ``year`` (default: the active year), from the snapshot."""
+    config = get_election_config()
+    year = config.year if year is None else year
+    return config.elections.get(year) or _default_rules(year)
+
+
+def get_voting_deadline(year):
+    return get_election(year).closes_at
+
+
+def is_voting_open(year=None, now=None):
+    rules = get_election(year)
+    now = now or timezone.now()
+    if rules.opens_at and now < rules.opens_at:
+        return False
+    return now <= rules.closes_at
+
+
+def is_voting_closed(year=None, now=None):
+    """True once the deadline has passed (not merely before ``opens_at``)."""
+    return (now or timezone.now()) > get_election(year).closes_at
@@ -1,4 +1,7 @@
 from .candidateView import CandidateDetailView
+from .exportView import VoteExportView
 from .homeView import HomePageView
-from .resultView import LiveResultsView, HistoryView
+from .perfView import PerformanceView
+from .resultView import LiveResultsView, LiveResultsStreamView, HistoryView
+from .searchView import CandidateAutocompleteView
 from .voteView import VoteCreateView, VotePendingView, VerifyView, AlreadyVotedView
\ No newline at end of file
@@ -1,10 +1,36 @@
 from django.views.generic import DetailView
 from django.shortcuts import get_object_or_404
-from ballon_dor.models import Candidate, Vote
-from ballon_dor.utils import get_active_year, get_voting_deadline
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from ballon_dor.caching import (
+    cached_result,
+    get_catalog_version,
+    get_election_version,
+    get_results_version,
+    page_etag,
+)
+from ballon_dor.models import Candidate
+from ballon_dor.routers import read_replica
+from ballon_dor.scoring import player_standing
+from ballon_dor.utils import get_active_year, get_voting_deadline, is_voting_closed
+
+
+def candidate_etag(request, year, slug):
+    active_year = get_active_year()
+    voting_closed = is_voting_closed(active_year)
+    return page_etag(
+        request,
+        active_year,
+        voting_closed,
+        get_election_version(),
+        get_catalog_version(),
+        get_results_version(year),
+    )
 
 
 # NEW: Candidate Detail View (year-specific)
+@method_decorator(read_replica, name="dispatch")
+@method_decorator(condition(etag_func=candidate_etag), name="dispatch")
 class CandidateDetailView(DetailView):
     model = Candidate
     template_name = "ballon_dor/candidate_detail.html"
@@ -12,12 +38,14 @@ class CandidateDetailView(DetailView):
 
     def get_object(self):
         return get_object_or_404(
-            Candidate, year=self.kwargs["year"], slug=self.kwargs["slug"]
+            Candidate.objects.select_related("player", "club"),
+            year=self.kwargs["year"],
+            slug=self.kwargs["slug"],
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        candidate = self.get_object()
+        candidate = self.object
         player = candidate.player
         year = candidate.year
 
@@ -25,46 +53,16 @@ class CandidateDetailView(DetailView):
         deadline = get_voting_deadline(active_year)
 
         # Get voting stats for this player in this year
-        first_votes = Vote.objects.filter(
-            player_1st=player, year=year, is_verified=True
-        ).count()
-        second_votes = Vote.objects.filter(
-            player_2nd=player, year=year, is_verified=True
-        ).count()
-        third_votes = Vote.objects.filter(
-            player_3rd=player, year=year, is_verified=True
-        ).count()
-
-        total_points = (first_votes * 5) + (second_votes * 3) + (third_votes * 1)
-
-        # Calculate current ranking
-        points_map = {
-            "player_1st": 5,
-            "player_2nd": 3,
-            "player_3rd": 1,
-        }
-        tally = {}
-
-        # Get all verified votes for this year
-        verified_votes = Vote.objects.filter(year=year, is_verified=True)
-
-        for vote in verified_votes:
-            for field, points in points_map.items():
-                vote_player = getattr(vote, field)
-                tally[vote_player] = tally.get(vote_player, 0) + points
-
-        # Sort and find current player's rank
-        sorted_results = sorted(tally.items(), key=lambda x: x[1], reverse=True)
-
-        current_rank = None
-        for i, (ranked_player, points) in enumerate(sorted_results):
-            if ranked_player.id == player.id:
-                current_rank = i + 1
-                break
+        score = cached_result(
+            year, f"standing:{player.id}", lambda: player_standing(year, player.id)
+        )
+        first_votes = score.first_votes if score else 0
+        second_votes = score.second_votes if score else 0
+        third_votes = score.third_votes if score else 0
+        total_points = score.points if score else 0
 
         # If player hasn't received votes yet, they're not ranked
-        if current_rank is None:
-            current_rank = "Unranked"
+        current_rank = score.rank if score else "Unranked"
 
         context["voting_stats"] = {
             "first_votes": first_votes,
@@ -0,0 +1,41 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.handlers.asgi import ASGIRequest
+from django.db import router
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from ballon_dor.exports import FORMATS, async_chunks, export_votes
+from ballon_dor.models import Vote
+from ballon_dor.routers import read_replica
+
+
+@method_decorator(read_replica, name="dispatch")
+@method_decorator(staff_member_required, name="dispatch")
+class VoteExportView(View):
+    """Stream a year's votes as CSV or NDJSON (``?format=``, ``?gzip=1``)."""
+
+    def get(self, request, year):
+        fmt = request.GET.get("format", "csv")
+        if fmt not in FORMATS:
+            return HttpResponseBadRequest("format must be csv or ndjson")
+        compress = request.GET.get("gzip") == "1"
+        verified_only = request.GET.get("verified") == "1"
+
+        filename = f"votes-{year}.{fmt}"
+        content_type = FORMATS[fmt]
+        if compress:
+            filename += ".gz"
+            content_type = "application/gzip"
+        # Rows are read while streaming, after the view returns, so pick the
+        # database now
+        using = router.db_for_read(Vote)
+        chunks = export_votes(year, fmt, compress, verified_only, using=using)
+        if isinstance(request, ASGIRequest):
+            chunks = async_chunks(chunks)
+        response = StreamingHttpResponse(
+            chunks,
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
@@ -1,11 +1,39 @@
 from django.views.generic import TemplateView
-from ballon_dor.models import Candidate, Vote
-from ballon_dor.utils import get_active_year, get_voting_deadline
-from django.core.paginator import Paginator
-from django.utils import timezone
-from collections import defaultdict
-
-
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from ballon_dor.caching import (
+    get_catalog_version,
+    get_election_version,
+    get_results_version,
+    page_etag,
+)
+from ballon_dor.facets import facet_count, get_facets
+from ballon_dor.models import Candidate
+from ballon_dor.pagination import keyset_page
+from ballon_dor.routers import read_replica
+from ballon_dor.scoring import get_final_result
+from ballon_dor.search import get_search_index
+from ballon_dor.utils import get_active_year, get_voting_deadline, is_voting_closed
+
+
+CANDIDATE_ORDERING = (("player__name", False), ("id", False))
+
+
+def home_etag(request, *args, **kwargs):
+    active_year = get_active_year()
+    voting_closed = is_voting_closed(active_year)
+    return page_etag(
+        request,
+        active_year,
+        voting_closed,
+        get_election_version(),
+        get_catalog_version(),
+        get_results_version(active_year),
+    )
+
+
+@method_decorator(read_replica, name="dispatch")
+@method_decorator(condition(etag_func=home_etag), name="dispatch")
 class HomePageView(TemplateView):
     """
     Display the homepage with a list of candidates for the active voting year.
@@ -16,8 +44,9 @@ class HomePageView(TemplateView):
     marked as contenders and passes them to the template for rendering.
 
     Context:
-        contenders (QuerySet): A queryset of Candidate objects that are marked
-                            as contenders for the active year.
+        page_obj (KeysetPage): The current page of filtered candidates.
+        final_result (FinalResult): The frozen outcome once voting has closed,
+                            otherwise None.
 
     Template:
         home.html
@@ -30,7 +59,7 @@ class HomePageView(TemplateView):
         active_year = get_active_year()
 
         deadline = get_voting_deadline(active_year)
-        voting_closed = timezone.now() > deadline
+        voting_closed = is_voting_closed(active_year)
 
         # Get filter parameters from URL
         # Without default value ("") - CRASHES if key doesn't exist!
@@ -52,68 +81,42 @@ class HomePageView(TemplateView):
         if country_filter:
             contenders = contenders.filter(player__country=country_filter)
 
+        facets = get_facets(active_year)
+
         if search_filter:
-            contenders = contenders.filter(player__name__icontains=search_filter)
+            # Accent-insensitive, typo-tolerant; the index lives in memory
+            matches = [
+                entry
+                for entry in get_search_index(active_year).search(search_filter)
+                if (not club_filter or entry.club == club_filter)
+                and (not country_filter or entry.country == country_filter)
+            ]
+            contenders = contenders.filter(pk__in=[entry.id for entry in matches])
+            results_count = len(matches)
+        else:
+            results_count = facet_count(facets, club_filter, country_filter)
 
-        # Randomize order
         contenders = contenders.order_by("player__name")
 
-        paginator = Paginator(contenders, 15)
-        page_number = self.request.GET.get("page")
-        page_obj = paginator.get_page(page_number)
-
-        # Reuse base queryset to get clubs and countries (don't filter)
-        clubs = (
-            base_queryset.values_list("club__name", flat=True)
-            .distinct()
-            .order_by("club__name")
-        )
-        countries = (
-            base_queryset.values_list("player__country", flat=True)
-            .distinct()
-            .order_by("player__country")
+        # Keyset pages: any page costs the same as the first, and nothing is counted
+        page_obj = keyset_page(
+            contenders, CANDIDATE_ORDERING, self.request.GET.get("cursor"), 15
         )
 
-        # Clean the data - in case some candidates don't have clubs/countries set
-        clubs_list = [club for club in clubs if club]
-        countries_list = [country for country in countries if country]
-
-        winner = None
-        total_points = 0
-        vote_stats = {}
-
-        if voting_closed:
-            scores = defaultdict(int)
-            votes = Vote.objects.filter(is_verified=True, year=active_year)
-
-            for vote in votes:
-                scores[vote.player_1st] += 5
-                scores[vote.player_2nd] += 3
-                scores[vote.player_3rd] += 1
-
-            if scores:
-                winner, total_points = max(scores.items(), key=lambda item: item[1])
-                vote_stats = {
-                    "total_votes": votes.count(),
-                    "countries": votes.values("voter_country").distinct().count(),
-                    "votes_for_winner": votes.filter(player_1st=winner).count(),
-                }
+        # Frozen after the deadline: one row lookup instead of vote aggregates
+        final_result = get_final_result(active_year) if voting_closed else None
 
         context_data = {
-            "contenders": contenders,
             "active_year": active_year,
-            "clubs": clubs_list,
-            "countries": countries_list,
+            "clubs": facets.clubs,
+            "countries": facets.countries,
             "current_club": club_filter,
             "current_country": country_filter,
             "current_search": search_filter,
-            "results_count": contenders.count(),
+            "results_count": results_count,
             "page_obj": page_obj,
-            "paginator": paginator,
             "voting_closed": voting_closed,
-            "winner": winner,
-            "total_points": total_points,
-            "vote_stats": vote_stats,
+            "final_result": final_result,
             "deadline": deadline,
         }
         context.update(context_data)
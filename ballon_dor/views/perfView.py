@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from ballon_dor.middleware import performance_log
+
+
+@method_decorator(staff_member_required, name="dispatch")
+class PerformanceView(View):
+    """Rolling per-URL timings collected by QueryTimingMiddleware (staff only)."""
+
+    def get(self, request):
+        return JsonResponse(
+            {
+                "enabled": settings.PERF_INSTRUMENTATION,
+                "views": performance_log.summary(),
+            }
+        )
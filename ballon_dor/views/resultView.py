@@ -1,11 +1,72 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import QueryDict, StreamingHttpResponse
+from django.http.request import split_domain_port, validate_host
+from django.utils.datastructures import CaseInsensitiveMapping
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.http import condition
 from django.views.generic import TemplateView, ListView
 
 from django.utils import timezone
 
-from ballon_dor.models import BallonDorResult, Vote
-from ballon_dor.utils import get_active_year, get_voting_deadline
+from ballon_dor.caching import (
+    cached_result,
+    get_catalog_version,
+    get_election_version,
+    get_results_version,
+    page_etag,
+)
+from ballon_dor.models import BallonDorResult
+from ballon_dor.pagination import keyset_page
+from ballon_dor.routers import read_replica
+from ballon_dor.scoring import ranked_scores, total_verified_votes
+from ballon_dor.utils import get_active_year, get_voting_deadline, is_voting_closed
+
+
+def top_results(year):
+    # Ranking and the top-30 cut both happen in the database
+    return {
+        "results": [
+            (score.rank, score.player, score.points)
+            for score in ranked_scores(year, limit=30)
+        ],
+        "total_votes": total_verified_votes(year),
+    }
+
+
+def live_results_etag(request, *args, **kwargs):
+    # The navbar shows the deadline and voting state on every page
+    active_year = get_active_year()
+    return page_etag(
+        request,
+        active_year,
+        is_voting_closed(active_year),
+        get_election_version(),
+        get_results_version(active_year),
+    )
+
 
+HISTORY_ORDERING = (("year", True), ("rank", False))
 
+
+def history_etag(request, *args, **kwargs):
+    return page_etag(
+        request,
+        is_voting_closed(),
+        get_election_version(),
+        get_catalog_version(),
+    )
+
+
+@method_decorator(read_replica, name="dispatch")
+@method_decorator(condition(etag_func=live_results_etag), name="dispatch")
 class LiveResultsView(TemplateView):
     template_name = "ballon_dor/live_results.html"
 
@@ -13,44 +74,211 @@ class LiveResultsView(TemplateView):
         context = super().get_context_data(**kwargs)
         active_year = get_active_year()
         deadline = get_voting_deadline(active_year)
-        points_map = {
-            "player_1st": 5,
-            "player_2nd": 3,
-            "player_3rd": 1,
-        }
-        tally = {}
+        # Cached until the next verified vote bumps the results version
+        context.update(
+            cached_result(active_year, "live_results", lambda: top_results(active_year))
+        )
+        context["results_version"] = get_results_version(active_year)
+        context["last_updated"] = timezone.now()
+        context["active_year"] = active_year
+        context["deadline"] = deadline
 
-        # Get all verified votes for this year
-        verified_votes = Vote.objects.filter(year=active_year, is_verified=True)
+        return context
 
-        for vote in verified_votes:
-            for field, points in points_map.items():
-                player = getattr(vote, field)
-                tally[player] = tally.get(player, 0) + points
 
-        # Sort and get top 30
-        sorted_results = sorted(tally.items(), key=lambda x: x[1], reverse=True)[:30]
+def results_snapshot(year):
+    """Compact form of the live results: ``[player_id, rank, name, points]`` rows."""
+    data = cached_result(year, "live_results", lambda: top_results(year))
+    return {
+        "rows": [
+            [player.id, rank, player.name, points]
+            for rank, player, points in data["results"]
+        ],
+        "total_votes": data["total_votes"],
+    }
 
-        # Handle ties - assign proper ranks
-        ranked_results = []
-        current_rank = 1
 
-        for i, (player, points) in enumerate(sorted_results):
-            if i > 0 and points < sorted_results[i - 1][1]:
-                current_rank = i + 1
-            ranked_results.append((current_rank, player, points))
+def results_delta(previous, current):
+    """
+    Describe how the live results changed between two snapshots.
 
-        context["results"] = ranked_results
-        context["total_votes"] = verified_votes.count()
-        context["last_updated"] = timezone.now()
-        context["active_year"] = active_year
-        context["deadline"] = deadline
+    Only rows whose rank or points moved are sent, plus the new row order, so
+    a viewer can patch the table in place. Returns ``None`` if nothing changed.
+    """
+    old_rows = {row[0]: row for row in previous["rows"]} if previous else {}
+    new_rows = {row[0]: row for row in current["rows"]}
+    changed = [row for row in current["rows"] if old_rows.get(row[0]) != row]
+    removed = [player_id for player_id in old_rows if player_id not in new_rows]
+    order = [row[0] for row in current["rows"]]
 
-        return context
+    if previous and not changed and not removed and order == list(old_rows):
+        return None
+    return {
+        "changed": changed,
+        "removed": removed,
+        "order": order,
+        "total_votes": current["total_votes"],
+    }
+
+
+# Year, version and snapshot reads of every open stream share this small
+# pool, so a thousand idle viewers cost a thousand coroutines, not threads
+STREAM_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="results-stream")
+
+
+def _in_stream_pool(func):
+    @wraps(func)
+    def call(*args):
+        try:
+            return func(*args)
+        finally:
+            # No request_finished here to recycle the thread's connection
+            close_old_connections()
 
+    return sync_to_async(call, thread_sensitive=False, executor=STREAM_EXECUTOR)
 
+
+class LiveResultsStreamView(View):
+    """
+    Server-sent events feed for ``live_results.html``.
+
+    Each open page holds one connection. The stream checks the results
+    version every ``poll_interval`` seconds (a single cache read) and only
+    sends an event when the tally actually changed. Connections are closed
+    after ``max_duration`` seconds; EventSource reconnects on its own.
+    Under ASGI, ``asgi.py`` serves this URL with ``live_results_stream_app``
+    instead, so idle viewers don't tie up threads.
+    """
+
+    poll_interval = 2
+    keepalive_interval = 15
+    max_duration = 5 * 60
+
+    async def get(self, request):
+        since = stream_position(request.headers, request.GET)
+        response = StreamingHttpResponse(
+            self.events(since), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # don't let nginx buffer events
+        return response
+
+    async def events(self, since):
+        loop = asyncio.get_running_loop()
+        year = await _in_stream_pool(get_active_year)()
+        snapshot = None
+        version = since
+        started = last_sent = loop.time()
+        poll_version = _in_stream_pool(get_results_version)
+
+        while loop.time() - started < self.max_duration:
+            current_version = str(await poll_version(year))
+            if current_version != version:
+                current = await _in_stream_pool(results_snapshot)(year)
+                delta = results_delta(snapshot, current)
+                if delta:
+                    yield f"id: {current_version}\ndata: {json.dumps(delta)}\n\n"
+                    last_sent = loop.time()
+                snapshot, version = current, current_version
+            elif loop.time() - last_sent >= self.keepalive_interval:
+                yield ": keep-alive\n\n"
+                last_sent = loop.time()
+            await asyncio.sleep(self.poll_interval)
+
+
+def stream_position(headers, query):
+    # On reconnect EventSource sends the last id it got; ?since= is only the
+    # version the page was rendered with
+    return headers.get("Last-Event-ID") or query.get("since")
+
+
+STREAM_HEADERS = [
+    (b"content-type", b"text/event-stream"),
+    (b"cache-control", b"no-cache"),
+    (b"x-accel-buffering", b"no"),
+    (b"x-content-type-options", b"nosniff"),
+]
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def live_results_stream_app(scope, receive, send):
+    """
+    ``LiveResultsStreamView`` as a bare ASGI app, mounted by ``asgi.py``.
+
+    Django's ASGI handler runs each request in a thread-sensitive context,
+    and the sync middleware and ``request_started`` receivers give it a
+    thread that lives until the response ends - for a stream, minutes. The
+    stream needs no session, user or CSRF check, so it skips the handler;
+    only the Host header is validated.
+    """
+    headers = CaseInsensitiveMapping(
+        {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+    )
+    domain, _ = split_domain_port(headers.get("Host", ""))
+    if not domain or not validate_host(domain, settings.ALLOWED_HOSTS):
+        await send({"type": "http.response.start", "status": 400, "headers": []})
+        await send({"type": "http.response.body", "body": b"Bad Request"})
+        return
+
+    since = stream_position(headers, QueryDict(scope.get("query_string", b"")))
+    await send(
+        {"type": "http.response.start", "status": 200, "headers": STREAM_HEADERS}
+    )
+    events = LiveResultsStreamView().events(since)
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    next_event = None
+    try:
+        while True:
+            next_event = asyncio.ensure_future(anext(events))
+            await asyncio.wait(
+                {next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected.done():
+                return
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                break
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": event.encode(),
+                    "more_body": True,
+                }
+            )
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        disconnected.cancel()
+        if next_event is not None and not next_event.done():
+            # The generator can't be closed while a step is still running
+            next_event.cancel()
+            await asyncio.wait({next_event})
+        await events.aclose()
+
+
+@method_decorator(read_replica, name="dispatch")
+@method_decorator(condition(etag_func=history_etag), name="dispatch")
 class HistoryView(ListView):
     model = BallonDorResult
     template_name = "ballon_dor/history.html"
     context_object_name = "results"
-    ordering = ["-year"]
+    paginate_by = 30
+
+    def get_queryset(self):
+        return BallonDorResult.objects.select_related(
+            "player", "club_at_award", "nationality_at_award"
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        # Keyset instead of offset pages: no COUNT, and old seasons are as cheap
+        page = keyset_page(
+            queryset, HISTORY_ORDERING, self.request.GET.get("cursor"), page_size
+        )
+        return None, page, page.object_list, page.has_next or page.has_previous
@@ -0,0 +1,32 @@
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views import View
+
+from ballon_dor.search import get_search_index
+from ballon_dor.utils import get_active_year
+
+AUTOCOMPLETE_LIMIT = 8
+
+
+class CandidateAutocompleteView(View):
+    """Search-as-you-type suggestions for the active year, served from memory."""
+
+    def get(self, request):
+        query = request.GET.get("q", "")
+        matches = get_search_index(get_active_year()).search(
+            query, limit=AUTOCOMPLETE_LIMIT
+        )
+        return JsonResponse(
+            {
+                "results": [
+                    {
+                        "name": entry.name,
+                        "club": entry.club or "",
+                        "url": reverse(
+                            "candidate_detail", args=[entry.year, entry.slug]
+                        ),
+                    }
+                    for entry in matches
+                ]
+            }
+        )
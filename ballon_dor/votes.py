@@ -0,0 +1,131 @@
+"""
+Write paths for votes.
+
+Kept as single SQL statements where the database allows it, so they stay
+cheap and race-free while thousands of people vote at once.
+"""
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .caching import bump_results_version
+from .models import Vote
+from .scoring import record_vote
+
+
+def _supports_upsert_returning():
+    return connection.vendor in ("postgresql", "sqlite") and (
+        connection.features.can_return_columns_from_insert
+    )
+
+
+def submit_vote(vote):
+    """
+    Store an unverified ``vote``, replacing the email's earlier pending vote.
+
+    Returns ``False`` (and writes nothing) if the email already has a verified
+    vote for the year; otherwise sets ``vote.pk`` and returns ``True``. On
+    PostgreSQL and SQLite this is a single ``INSERT ... ON CONFLICT DO UPDATE
+    ... RETURNING``, so two submissions racing on the same email can't trip
+    the ``unique_email_per_year`` constraint.
+    """
+    fields = [f for f in Vote._meta.concrete_fields if not f.primary_key]
+    if _supports_upsert_returning():
+        quote = connection.ops.quote_name
+        table = quote(Vote._meta.db_table)
+        columns = [quote(f.column) for f in fields]
+        replaced = [
+            f"{quote(f.column)} = excluded.{quote(f.column)}"
+            for f in fields
+            if f.name not in ("year", "email")
+        ]
+        values = [
+            f.get_db_prep_save(f.pre_save(vote, True), connection) for f in fields
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON CONFLICT ({quote('year')}, {quote('email')}) "
+                f"DO UPDATE SET {', '.join(replaced)} "
+                f"WHERE NOT {table}.{quote('is_verified')} "
+                f"RETURNING {quote('id')}",
+                values,
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return False
+        vote.pk = row[0]
+        return True
+
+    # Other backends: lock the email's existing row, if any, then write
+    with transaction.atomic():
+        existing = (
+            Vote.objects.select_for_update()
+            .filter(year=vote.year, email=vote.email)
+            .first()
+        )
+        if existing is None:
+            vote.save()
+            return True
+        if existing.is_verified:
+            return False
+        vote.pk = existing.pk
+        vote.created_at = timezone.now()  # auto_now_add only fills inserts
+        vote.save(force_update=True)
+    return True
+
+
+def _claim_token(token):
+    """
+    Flip the pending vote with ``token`` to verified and return it, or ``None``.
+
+    On PostgreSQL and SQLite this is one ``UPDATE ... RETURNING`` that hits
+    the partial ``vote_pending_token_idx`` index, so a double-clicked link
+    can only ever verify the vote once.
+    """
+    if _supports_upsert_returning():
+        table = connection.ops.quote_name(Vote._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET is_verified = %s, token = %s "
+                f"WHERE token = %s AND NOT is_verified "
+                f"RETURNING id, year, player_1st_id, player_2nd_id, player_3rd_id",
+                [True, "", token],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        pk, year, first, second, third = row
+        return Vote(
+            pk=pk,
+            year=year,
+            player_1st_id=first,
+            player_2nd_id=second,
+            player_3rd_id=third,
+            is_verified=True,
+        )
+
+    # Other backends: a conditional UPDATE still makes the flip atomic
+    vote = Vote.objects.filter(token=token, is_verified=False).first()
+    if vote and Vote.objects.filter(pk=vote.pk, is_verified=False).update(
+        is_verified=True, token=""
+    ):
+        return vote
+    return None
+
+
+def verify_vote(token):
+    """
+    Verify the vote behind a confirmation link and add it to the tally.
+
+    Returns the verified ``Vote`` (only its ids and year are loaded), or
+    ``None`` if the token is unknown or was already used.
+    """
+    with transaction.atomic():
+        vote = _claim_token(token)
+        if vote is None:
+            return None
+        record_vote(vote)
+        transaction.on_commit(lambda: bump_results_version(vote.year))
+    return vote
@@ -12,5 +12,22 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ballon_dor_project.settings")
+# Django's docs: disable persistent connections under ASGI
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up
+from django.urls import reverse  # noqa: E402
+
+from ballon_dor.views.resultView import live_results_stream_app  # noqa: E402
+
+STREAM_PATH = reverse("live_results_stream")
+
+
+async def application(scope, receive, send):
+    # The live results stream skips Django's handler and sync middleware,
+    # which would hold a thread for each open stream
+    if scope["type"] == "http" and scope["path"] == STREAM_PATH:
+        return await live_results_stream_app(scope, receive, send)
+    return await django_application(scope, receive, send)
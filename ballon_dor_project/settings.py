@@ -14,10 +14,6 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
-import cloudinary_storage
 from pathlib import Path
 import os
 import dj_database_url
@@ -72,6 +68,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "ballon_dor.middleware.QueryTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -79,8 +76,53 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "ballon_dor.routers.ReplicaMiddleware",
 ]
 
+# Per-request SQL/render timings as Server-Timing headers (off by default)
+PERF_INSTRUMENTATION = os.environ.get("PERF_INSTRUMENTATION", "False") == "True"
+
+# Token buckets for /vote/ and /verify/: "memory" keeps them per process,
+# "cache" shares them through CACHES. Limits are (burst, refills per minute).
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "True") == "True"
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+# Behind a proxy (Railway/Heroku router, nginx) the client is in
+# X-Forwarded-For; REMOTE_ADDR would put every voter in the proxy's bucket.
+# On by default on Railway and Heroku (RAILWAY_ENVIRONMENT / DYNO are set).
+BEHIND_ROUTER = bool(os.environ.get("RAILWAY_ENVIRONMENT") or os.environ.get("DYNO"))
+RATE_LIMIT_BEHIND_PROXY = (
+    os.environ.get("RATE_LIMIT_BEHIND_PROXY", str(BEHIND_ROUTER)) == "True"
+)
+RATE_LIMITS = {
+    "vote_ip": (10, 5),
+    "vote_domain": (200, 120),
+    "verify_ip": (20, 20),
+}
+# "vote_domain" catches throwaway domains. One bucket for all gmail.com
+# voters would turn away real fans at peak, so big webmail providers only
+# get the per-IP limit.
+RATE_LIMIT_EXEMPT_DOMAINS = {
+    "gmail.com",
+    "googlemail.com",
+    "outlook.com",
+    "hotmail.com",
+    "live.com",
+    "msn.com",
+    "yahoo.com",
+    "icloud.com",
+    "me.com",
+    "aol.com",
+    "proton.me",
+    "protonmail.com",
+    "gmx.com",
+    "gmx.de",
+    "web.de",
+    "mail.ru",
+    "yandex.ru",
+    "qq.com",
+    "163.com",
+}
+
 ROOT_URLCONF = "ballon_dor_project.urls"
 
 TEMPLATES = [
@@ -94,6 +136,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "ballon_dor.context_processors.election",
             ],
         },
     },
@@ -107,24 +150,62 @@ CLOUDINARY_STORAGE = {
     "API_KEY": os.environ.get("CLOUDINARY_API_KEY"),
     "API_SECRET": os.environ.get("CLOUDINARY_API_SECRET"),
 }
-cloudinary.config(
-    cloud_name=os.environ.get("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.environ.get("CLOUDINARY_API_KEY"),
-    api_secret=os.environ.get("CLOUDINARY_API_SECRET"),
-    secure=True,  # Use HTTPS URLs
-)
+# cloudinary.config() is called from BallonDorConfig.ready() with these values,
+# so importing settings doesn't pull in the Cloudinary SDK.
 
 DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
 
+# Persistent connections only under WSGI: with ASGI each request's sync work
+# may run on a new thread, leaving its connection open. asgi.py sets
+# DB_CONN_MAX_AGE=0.
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", 600))
+
 DATABASES = {
     "default": dj_database_url.config(
-        default=os.getenv("DATABASE_URL"), conn_max_age=600
+        default=os.getenv("DATABASE_URL"), conn_max_age=DB_CONN_MAX_AGE
     )
 }
 
+# Optional read replica for the results, candidate and history pages and the
+# staff exports (two local SQLite files work too). Writes, and reads right
+# after verifying a vote, stay on "default"; see ballon_dor/routers.py.
+REPLICA_DATABASE = None
+if os.environ.get("DATABASE_REPLICA_URL"):
+    DATABASES["replica"] = dj_database_url.parse(
+        os.environ["DATABASE_REPLICA_URL"], conn_max_age=DB_CONN_MAX_AGE
+    )
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+    REPLICA_DATABASE = "replica"
+DATABASE_ROUTERS = ["ballon_dor.routers.ReplicaRouter"]
+# The replica lag we tolerate. A client's reads stay on the primary this long
+# after verifying a vote, and tallies read from the replica are cached only
+# this long. Catalog lists, the search index and the election snapshot are
+# always built from the primary.
+REPLICA_PIN_SECONDS = 10
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Results are versioned per verified vote, so all workers must share the
+# cache in production (REDIS_URL, or the file cache in settings_production).
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "ballon-dor",
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
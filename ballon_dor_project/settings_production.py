@@ -21,6 +21,15 @@ DATABASES = {
     }
 }
 
+# Cache shared by all gunicorn workers (vote results are versioned in it)
+if not os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": "/var/tmp/ballon_dor_cache",
+        }
+    }
+
 # Static files (CSS, JavaScript, Images) - for production
 STATIC_URL = "/static/"
 STATIC_ROOT = os.path.join(